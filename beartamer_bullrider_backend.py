@@ -14,28 +14,140 @@ A production-ready FastAPI server for real-time stock market predictions using:
 """
 
 import asyncio
+import gzip
+import hashlib
+import heapq
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+import math
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field, fields
 from enum import Enum
+from functools import reduce
+from statistics import NormalDist
 
 import uvicorn
-from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks
+from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 import numpy as np
 from cachetools import TTLCache
 
+from beartamer_bullrider_market_data import (
+    MARKET_WIDE,
+    REFRESH_TRIGGERS,
+    Quote,
+    QuoteService,
+    TriggerEvent,
+    TriggerEventBus,
+    create_market_data_provider,
+    symbol_seed_sequence
+)
+from beartamer_bullrider_metrics import MetricsRegistry, profile_awaitable
+from historical_bar_store import BAR_STORE_ENV, HistoricalBarStore
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # ===== SETUP =====
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Configuration
 CACHE_TTL = 300  # 5 minutes
+QUIET_CACHE_TTL = int(os.getenv("BULLRIDER_QUIET_CACHE_TTL", "1800"))  # max age for symbols without events
+RECOMPUTE_ON_TRIGGER = os.getenv("BULLRIDER_RECOMPUTE_ON_TRIGGER", "1") == "1"  # refill evicted entries
+
+# Precompute scheduler: keep the most requested cache keys warm (WARMUP_TOP_K=0 disables)
+WARMUP_TOP_K = int(os.getenv("BULLRIDER_WARMUP_TOP_K", "50"))
+WARMUP_LEAD_TIME = float(os.getenv("BULLRIDER_WARMUP_LEAD_TIME", "30"))  # seconds before expiry
+WARMUP_INTERVAL = float(os.getenv("BULLRIDER_WARMUP_INTERVAL", "5"))  # seconds between passes
+WARMUP_CPU_BUDGET = float(os.getenv("BULLRIDER_WARMUP_CPU_BUDGET", "0.25"))  # CPU-seconds per wall-second
+FREQUENCY_HALF_LIFE = 600.0  # seconds for a key's request count to halve
+FREQUENCY_MAX_KEYS = 10_000
+
+# Admission control (a rate of 0 disables that limit)
+MAX_IN_FLIGHT = int(os.getenv("BULLRIDER_MAX_IN_FLIGHT", "256"))  # concurrent requests before 503
+CLIENT_RATE_LIMIT = float(os.getenv("BULLRIDER_CLIENT_RPS", "50"))  # requests/second per client address
+CLIENT_BURST = float(os.getenv("BULLRIDER_CLIENT_BURST", "100"))
+API_KEY_RATE_LIMIT = float(os.getenv("BULLRIDER_API_KEY_RPS", "200"))  # requests/second per API key
+API_KEY_BURST = float(os.getenv("BULLRIDER_API_KEY_BURST", "400"))
+WS_MESSAGE_RATE_LIMIT = float(os.getenv("BULLRIDER_WS_MESSAGES_PER_SECOND", "5"))  # per connection
+WS_MESSAGE_BURST = float(os.getenv("BULLRIDER_WS_MESSAGE_BURST", "10"))
+API_KEY_HEADER = "X-API-Key"
+RATE_LIMIT_MAX_KEYS = 100_000  # tracked clients/keys; the least recently seen are dropped
+ADMISSION_EXEMPT_PATHS = ("/health", "/metrics")
+
+# Response encoding: bodies are compressed once per cache entry, so favour ratio over speed
+COMPRESS_MIN_BYTES = 500
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+WS_PER_MESSAGE_DEFLATE = os.getenv("BULLRIDER_WS_DEFLATE", "1") == "1"
 MAX_CACHE_SIZE = 1000
+LAYER_MEMO_SIZE = 5000  # entries per memoized layer
+BAR_STORE_PATH = os.getenv(BAR_STORE_ENV)  # HistoricalBarStore root, optional
 PREDICTION_UPDATE_INTERVAL = 2.0  # seconds
+RNG_SEED = int(os.getenv("BULLRIDER_RNG_SEED", "2025"))  # root of every random stream
+
+# Layer execution: thread pool for NumPy math, process pool (0 = disabled) for pure-Python models
+LAYER_THREAD_WORKERS = int(os.getenv("BULLRIDER_THREAD_WORKERS", "4"))
+LAYER_PROCESS_WORKERS = int(os.getenv("BULLRIDER_PROCESS_WORKERS", "0"))
+LAYER_TIMEOUT = float(os.getenv("BULLRIDER_LAYER_TIMEOUT", "10.0"))  # seconds
+LAYER_EXECUTION = {
+    "crystalline_intent": "inline",
+    "echo_prime": "thread",
+    "parallel_pathways": "thread",
+    "echo_resonance": "thread",
+    "real_time_data": "inline",
+    "echo_vision": "thread",
+    "temporal_anchoring": "thread"
+}
+MEMOIZED_LAYERS = (
+    "echo_prime",
+    "parallel_pathways",
+    "echo_resonance",
+    "real_time_data",
+    "echo_vision",
+    "temporal_anchoring"
+)
+LAYER_NAMES = (
+    "crystalline_intent",
+    "echo_prime",
+    "parallel_pathways",
+    "echo_resonance",
+    "real_time_data",
+    "echo_vision",
+    "temporal_anchoring"
+)
+QUOTE_DEPENDENT_LAYERS = ("real_time_data", "echo_vision", "temporal_anchoring")
+
+# Risk tolerance -> (downside, upside) multiples of the expected move for the trade setup
+RISK_PROFILES = {
+    "conservative": (0.6, 1.0),
+    "moderate": (0.9, 1.3),
+    "aggressive": (1.2, 1.8)
+}
+
+# Portfolio endpoint
+MAX_PORTFOLIO_SIZE = 500
+PORTFOLIO_LOOKBACK = 252  # daily bars of stored history behind the covariance matrix
+TRADING_DAYS = 252  # annualised implied vol -> daily variance for names without history
+
+# Per-layer overrides, e.g. BULLRIDER_LAYER_EXECUTION="echo_prime=process,echo_vision=inline"
+for _override in filter(None, os.getenv("BULLRIDER_LAYER_EXECUTION", "").split(",")):
+    _layer, _mode = _override.split("=")
+    LAYER_EXECUTION[_layer.strip()] = _mode.strip()
 
 # ===== DATA MODELS =====
 
@@ -44,7 +156,7 @@ class SignalType(str, Enum):
     BEARISH = "bearish"
     NEUTRAL = "neutral"
 
-@dataclass
+@dataclass(slots=True)
 class CrystallineIntent:
     """Layer 1: Clarify the prediction question"""
     ticker: str
@@ -53,7 +165,7 @@ class CrystallineIntent:
     clarity_score: float  # 0-1
     refined_focus: str
 
-@dataclass
+@dataclass(slots=True)
 class EchoPrime:
     """Layer 2: 5 Frameworks Convergence"""
     rationalist_prediction: float  # Technical Analysis
@@ -63,7 +175,7 @@ class EchoPrime:
     quantum_prediction: float      # ML Ensemble
     convergence_score: float  # How much do they agree?
 
-@dataclass
+@dataclass(slots=True)
 class ParallelPathways:
     """Layer 3: 5 Simultaneous Branches"""
     conservative: float
@@ -74,7 +186,7 @@ class ParallelPathways:
     consensus_prediction: float
     branch_voting: int  # How many agree?
 
-@dataclass
+@dataclass(slots=True)
 class EchoResonance:
     """Layer 4: 5 Voices Reach Harmonic Consensus"""
     synthesizer: float  # What all agree on
@@ -85,7 +197,7 @@ class EchoResonance:
     harmonic_consensus: float
     resonance_score: float
 
-@dataclass
+@dataclass(slots=True)
 class RealTimeDataFusion:
     """Layer 5: Live Market Inputs"""
     current_price: float
@@ -96,7 +208,7 @@ class RealTimeDataFusion:
     macro_indicators: float
     data_quality_score: float
 
-@dataclass
+@dataclass(slots=True)
 class EchoVision:
     """Layer 6: 7 Analytical Lenses"""
     reductionist: float     # Break into parts
@@ -108,16 +220,38 @@ class EchoVision:
     quantum: float          # Uncertainty
     synthesis_score: float
 
-@dataclass
+@dataclass(slots=True)
 class TemporalAnchoring:
     """Layer 7: Time-aware Calibration"""
     validity_horizon: int   # days valid
     decay_curve: float      # confidence decay rate
-    refresh_triggers: List[str]
+    refresh_triggers: Tuple[str, ...]
     seasonality_adjustment: float
     calibration_score: float
 
-@dataclass
+@dataclass(slots=True)
+class EchoVisionCurve:
+    """Layer 6 evaluated across a horizon array (one list entry per horizon)"""
+    horizons: List[int]
+    reductionist: List[float]
+    holistic: List[float]
+    temporal: List[float]
+    structural: List[float]
+    functional: List[float]
+    energetic: List[float]
+    quantum: List[float]
+    synthesis_score: List[float]
+
+@dataclass(slots=True)
+class TemporalAnchoringCurve:
+    """Layer 7 evaluated across a horizon array"""
+    validity_horizon: List[int]
+    decay_curve: List[float]
+    refresh_triggers: Tuple[str, ...]
+    seasonality_adjustment: float
+    calibration_score: List[float]
+
+@dataclass(slots=True)
 class PredictionResult:
     """Complete 7-Layer Prediction Result"""
     ticker: str
@@ -148,227 +282,1199 @@ class PredictionResult:
     validity_until: str
     framework_agreement: int  # Number of frameworks agreeing
 
+@dataclass(slots=True)
+class TermStructureResult:
+    """7-Layer prediction for several horizons from one pass (one list entry per horizon)"""
+    ticker: str
+    current_price: float
+    horizons: List[int]
+    predicted_price: List[float]
+    price_change_percent: List[float]
+    confidence: List[float]
+    signal: List[SignalType]
+
+    # Trade Setup
+    entry_price: float
+    stop_loss: List[float]
+    target_1: List[float]
+    target_2: List[float]
+    risk_reward_ratio: List[float]
+
+    # Shared layers, computed once
+    echo_prime: EchoPrime
+    parallel_pathways: ParallelPathways
+    echo_resonance: EchoResonance
+    real_time_data: RealTimeDataFusion
+
+    # Horizon-dependent layers
+    clarity_score: List[float]
+    echo_vision: EchoVisionCurve
+    temporal_anchoring: TemporalAnchoringCurve
+
+    # Metadata
+    generated_at: str
+    validity_until: List[str]
+    framework_agreement: List[int]
+
+
+@dataclass(slots=True)
+class PortfolioResult:
+    """Portfolio-level prediction over one horizon (returns as fractions, not percent)"""
+    tickers: List[str]
+    weights: List[float]
+    horizon: int
+
+    # Constituents
+    expected_returns: List[float]
+    confidence: List[float]
+    signal: List[SignalType]
+    risk_contribution: List[float]  # share of portfolio variance, sums to 1
+
+    # Portfolio
+    expected_return: float
+    volatility: float
+    value_at_risk: float  # loss not exceeded with probability confidence_level
+    confidence_level: float
+
+    # Covariance provenance
+    history_coverage: float  # fraction of constituents with stored history
+    observations: int        # aligned daily returns behind the covariance
+
+    generated_at: str
+
 # ===== REQUEST/RESPONSE MODELS =====
 
 class PredictionRequest(BaseModel):
     ticker: str
-    horizon: int = 7  # days
+    horizon: int = Field(7, gt=0)  # days
+    analysis_type: str = "ensemble"
+    risk_tolerance: str = "moderate"
+    horizons: Optional[List[int]] = None  # term structure in one pass; overrides horizon
+
+    @field_validator("horizons")
+    @classmethod
+    def _positive_horizons(cls, horizons: Optional[List[int]]) -> Optional[List[int]]:
+        if horizons is not None and (not horizons or min(horizons) <= 0):
+            raise ValueError("horizons must be a non-empty list of positive days")
+        return horizons
+
+class PortfolioRequest(BaseModel):
+    tickers: List[str]
+    weights: Optional[List[float]] = None  # normalised to sum to 1; equal per listing if omitted; duplicates add up
+    horizon: int = Field(7, gt=0)  # days
     analysis_type: str = "ensemble"
     risk_tolerance: str = "moderate"
+    confidence_level: float = Field(0.95, gt=0, lt=1)
+    lookback: int = Field(PORTFOLIO_LOOKBACK, gt=0)  # bars of history for the covariance
+
+class TriggerEventRequest(BaseModel):
+    symbol: str  # "*" for a market-wide event
+    trigger: str
+    detail: Optional[str] = None
 
 class PredictionResponse(BaseModel):
     success: bool
     message: str
     prediction: Optional[Dict]
     error: Optional[str] = None
+    profile: Optional[str] = None  # text profile summary when requested with ?profile=1
+
+# ===== LAYER MATH =====
+# Pure functions of their inputs so LayerExecutor can run them on the event
+# loop, in the thread pool, or pickle them into the process pool.
+
+# ===== LAYER 1: CRYSTALLINE INTENT =====
+def compute_crystalline_intent(ticker: str, horizon: int, analysis_type: str) -> CrystallineIntent:
+    """Clarify and refine the prediction question"""
+
+    # Analyze request ambiguity
+    clarity_factors = {
+        "ticker_clarity": 1.0 if len(ticker) <= 5 else 0.8,
+        "horizon_clarity": 1.0 if horizon > 0 else 0.5,
+        "type_clarity": 0.95,
+    }
+
+    clarity_score = float(np.mean(list(clarity_factors.values())))
+
+    # Refine focus
+    refined_focus = f"{horizon}-day {analysis_type} prediction on {ticker}"
+
+    return CrystallineIntent(
+        ticker=ticker,
+        horizon=horizon,
+        analysis_type=analysis_type,
+        clarity_score=clarity_score,
+        refined_focus=refined_focus
+    )
+
+# ===== LAYER 2: ECHO PRIME (5 FRAMEWORKS) =====
+def compute_echo_prime(rng: np.random.Generator) -> EchoPrime:
+    """5 frameworks converge on prediction"""
+
+    # Base prediction (mock data - replace with real models), one batched draw
+    noise = rng.normal(0, [5, 0.02, 0.02, 0.02, 0.02, 0.02])
+    base_price = 100.0 + float(noise[0])
+
+    # 5 Framework predictions with slight variation
+    (
+        rationalist,       # Technical Analysis
+        empiricist,        # Historical
+        phenomenological,  # Psychology
+        systemic,          # Market Dynamics
+        quantum            # ML Ensemble
+    ) = (base_price * (1 + noise[1:])).tolist()
+
+    # Calculate convergence
+    predictions = [rationalist, empiricist, phenomenological, systemic, quantum]
+    std_dev = float(np.std(predictions))
+    convergence = 1.0 - min(std_dev / float(np.mean(predictions)), 1.0)
+
+    return EchoPrime(
+        rationalist_prediction=rationalist,
+        empiricist_prediction=empiricist,
+        phenomenological_prediction=phenomenological,
+        systemic_prediction=systemic,
+        quantum_prediction=quantum,
+        convergence_score=convergence
+    )
+
+# ===== LAYER 3: PARALLEL PATHWAYS (5 BRANCHES) =====
+def compute_parallel_pathways(prime: EchoPrime) -> ParallelPathways:
+    """5 simultaneous prediction branches"""
+
+    base = float(np.mean([
+        prime.rationalist_prediction,
+        prime.empiricist_prediction,
+        prime.phenomenological_prediction,
+        prime.systemic_prediction,
+        prime.quantum_prediction
+    ]))
+
+    conservative = base * 0.97  # -3% downside protection
+    probable = base * 1.00      # Most likely
+    optimistic = base * 1.025   # +2.5% upside
+    data_driven = base * 0.99   # Pure stats
+    ml_enhanced = base * 1.005  # Neural net
+
+    # Consensus
+    pathways = [conservative, probable, optimistic, data_driven, ml_enhanced]
+    consensus = float(np.median(pathways))
+
+    # Count agreement (within 2%)
+    agreement = sum(1 for p in pathways if abs(p - consensus) / consensus < 0.02)
+
+    return ParallelPathways(
+        conservative=conservative,
+        probable=probable,
+        optimistic=optimistic,
+        data_driven=data_driven,
+        ml_enhanced=ml_enhanced,
+        consensus_prediction=consensus,
+        branch_voting=agreement
+    )
+
+# ===== LAYER 4: ECHO RESONANCE (5 VOICES) =====
+def compute_echo_resonance(pathways: ParallelPathways, prime: EchoPrime) -> EchoResonance:
+    """5 voices reach harmonic consensus"""
+
+    base = pathways.consensus_prediction
+
+    # 5 Voice perspectives
+    synthesizer = base * (1 + prime.convergence_score * 0.01)  # What all agree on
+    rationalist_voice = base * 0.99
+    creator_voice = base * 1.01  # New patterns
+    observer_voice = base  # Objective
+    questioner_voice = base * 0.995  # Critical thinking
+
+    voices = [synthesizer, rationalist_voice, creator_voice, observer_voice, questioner_voice]
+    harmonic = float(np.mean(voices))
+    resonance_std = float(np.std(voices))
+    resonance_score = 1.0 - min(resonance_std / harmonic, 1.0)
+
+    return EchoResonance(
+        synthesizer=synthesizer,
+        rationalist_voice=rationalist_voice,
+        creator_voice=creator_voice,
+        observer_voice=observer_voice,
+        questioner_voice=questioner_voice,
+        harmonic_consensus=harmonic,
+        resonance_score=resonance_score
+    )
+
+# ===== LAYER 5: REAL-TIME DATA FUSION =====
+def compute_real_time_data(quote: Quote) -> RealTimeDataFusion:
+    """Live market inputs"""
+
+    current_price = quote.price
+    volume = quote.volume
+    bid_ask_spread = quote.ask - quote.bid  # dollars
+    volatility_smile = quote.implied_volatility  # IV range
+    news_sentiment = quote.news_sentiment  # -1 to +1
+    macro_indicators = quote.macro_score  # composite score
+
+    data_quality = float(np.mean([
+        1.0 if volume > 50_000_000 else 0.7,
+        1.0 if bid_ask_spread < 0.1 else 0.8,
+        0.9,  # volatility baseline
+        0.8 + (news_sentiment + 1) / 2 * 0.2,
+        macro_indicators
+    ]))
+
+    return RealTimeDataFusion(
+        current_price=current_price,
+        volume=volume,
+        bid_ask_spread=bid_ask_spread,
+        volatility_smile=volatility_smile,
+        news_sentiment=news_sentiment,
+        macro_indicators=macro_indicators,
+        data_quality_score=data_quality
+    )
+
+# ===== LAYER 6: ECHO VISION (7 LENSES) =====
+def compute_echo_vision_curve(
+    horizons: List[int],
+    resonance: EchoResonance,
+    data: RealTimeDataFusion
+) -> EchoVisionCurve:
+    """7 analytical lenses, evaluated for every horizon at once"""
+
+    base = resonance.harmonic_consensus
+    h = np.asarray(horizons, dtype=float)
+    flat = np.ones_like(h)
+
+    # 7 Perspectives (only the temporal lens depends on the horizon)
+    lenses = np.column_stack([
+        base * 0.98 * flat,   # Reductionist: break into parts
+        base * 1.01 * flat,   # Holistic: system as whole
+        base * (1 + h * 0.001),  # Temporal: time dynamics
+        base * 0.99 * flat,   # Structural: relationships
+        base * 1.00 * flat,   # Functional: purpose
+        base * (1 + data.volume / 500_000_000) * flat,  # Energetic: flow
+        base * (1 + data.volatility_smile / 2) * flat   # Quantum: uncertainty
+    ])
+    synthesis = np.median(lenses, axis=1)
+    synthesis_std = np.std(lenses, axis=1)
+    synthesis_score = 1.0 - np.minimum(synthesis_std / synthesis, 1.0)
+
+    return EchoVisionCurve(list(horizons), *lenses.T.tolist(), synthesis_score.tolist())
+
+
+def compute_echo_vision(
+    intent: CrystallineIntent,
+    prime: EchoPrime,
+    pathways: ParallelPathways,
+    resonance: EchoResonance,
+    data: RealTimeDataFusion
+) -> EchoVision:
+    """7 analytical lenses"""
+    curve = compute_echo_vision_curve([intent.horizon], resonance, data)
+    return EchoVision(*(getattr(curve, f.name)[0] for f in fields(EchoVision)))
+
+def lens_consensus(vision) -> np.ndarray:
+    """Median of the 7 lens price levels per horizon (EchoVision or EchoVisionCurve)"""
+    lenses = [np.atleast_1d(getattr(vision, f.name)) for f in fields(EchoVision) if f.name != "synthesis_score"]
+    return np.median(np.column_stack(lenses), axis=1)
+
+# ===== LAYER 7: TEMPORAL ANCHORING =====
+def compute_temporal_anchoring_curve(horizons: List[int], synthesis_score: List[float]) -> TemporalAnchoringCurve:
+    """Time-aware calibration, evaluated for every horizon at once"""
+
+    validity_horizon = np.asarray(horizons, dtype=float)
+    decay_curve = 0.95 ** (1 / validity_horizon)  # Exponential decay
+
+    # Seasonality (simplified)
+    today = datetime.now()
+    month = today.month
+    seasonality = 0.95 + (1 - abs(month - 6.5) / 6.5) * 0.1  # Peak in June
+
+    calibration = (np.asarray(synthesis_score) + 0.85) / 2  # Blend with default
+
+    return TemporalAnchoringCurve(
+        validity_horizon=list(horizons),
+        decay_curve=decay_curve.tolist(),
+        refresh_triggers=REFRESH_TRIGGERS,
+        seasonality_adjustment=seasonality,
+        calibration_score=calibration.tolist()
+    )
+
+
+def compute_temporal_anchoring(horizon: int, vision: EchoVision) -> TemporalAnchoring:
+    """Time-aware calibration"""
+    curve = compute_temporal_anchoring_curve([horizon], [vision.synthesis_score])
+    return TemporalAnchoring(
+        validity_horizon=horizon,
+        decay_curve=curve.decay_curve[0],
+        refresh_triggers=curve.refresh_triggers,
+        seasonality_adjustment=curve.seasonality_adjustment,
+        calibration_score=curve.calibration_score[0]
+    )
+
+# ===== TRADE SETUP =====
+def compute_trade_setup_curve(
+    clarity: np.ndarray,
+    prime: EchoPrime,
+    pathways: ParallelPathways,
+    resonance: EchoResonance,
+    data: RealTimeDataFusion,
+    consensus: np.ndarray,
+    synthesis: np.ndarray,
+    calibration: np.ndarray,
+    risk_tolerance: str
+) -> Dict[str, np.ndarray]:
+    """
+    Prediction, confidence and trade setup as arrays over the horizon axis.
+    consensus is the lens consensus price (lens_consensus). The frameworks
+    price on their own scale, so it becomes a return against the most-likely
+    pathway and is applied to the live price.
+    """
+
+    # Get consensus prediction
+    current_price = data.current_price
+    expected_return = consensus / pathways.probable - 1
+    predicted_price = current_price * (1 + expected_return)
+    price_change_pct = expected_return * 100
+
+    # Calculate confidence (weighted average of all 7 layers)
+    confidence = (
+        clarity * 0.15 +
+        prime.convergence_score * 0.15 +
+        pathways.branch_voting / 5 * 0.10 +
+        resonance.resonance_score * 0.12 +
+        data.data_quality_score * 0.08 +
+        synthesis * 0.15 +
+        calibration * 0.25
+    )
+
+    # Determine signal
+    confident = confidence > 0.80
+    signal = np.where(
+        confident & (price_change_pct > 0), SignalType.BULLISH.value,
+        np.where(confident & (price_change_pct < 0), SignalType.BEARISH.value, SignalType.NEUTRAL.value)
+    )
+
+    # Trade setup (Risk/Reward Analysis)
+    downside_multiple, upside_multiple = RISK_PROFILES.get(
+        risk_tolerance, RISK_PROFILES["moderate"]
+    )
+    upside = np.abs(price_change_pct) * upside_multiple
+    downside = -np.abs(price_change_pct) * downside_multiple
+
+    stop_loss = current_price * (1 + downside / 100)
+    target_1 = current_price * (1 + upside / 100)
+    target_2 = current_price * (1 + upside * 1.5 / 100)
+    risk_reward = np.divide(upside, np.abs(downside), out=np.zeros_like(upside), where=downside != 0)
+
+    # Framework agreement
+    frameworks_agreeing = (
+        (clarity > 0.85).astype(int) +
+        (prime.convergence_score > 0.85) +
+        (pathways.branch_voting >= 4) +
+        (resonance.resonance_score > 0.85) +
+        (data.data_quality_score > 0.80) +
+        (synthesis > 0.85) +
+        (calibration > 0.80)
+    )
+
+    return {
+        "predicted_price": predicted_price,
+        "price_change_percent": price_change_pct,
+        "confidence": confidence,
+        "signal": signal,
+        "stop_loss": stop_loss,
+        "target_1": target_1,
+        "target_2": target_2,
+        "risk_reward_ratio": risk_reward,
+        "framework_agreement": frameworks_agreeing
+    }
+
+# ===== PORTFOLIO RISK =====
+def align_returns(series: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """(timestamps, returns) per symbol -> (observations, symbols) matrix on common timestamps"""
+    common = reduce(np.intersect1d, (timestamps for timestamps, _ in series))
+    return np.column_stack([
+        returns[np.searchsorted(timestamps, common)] for timestamps, returns in series
+    ]) if len(common) else np.empty((0, len(series)))
+
+
+def compute_portfolio_risk(
+    weights: np.ndarray,
+    expected_returns: np.ndarray,
+    daily_covariance: np.ndarray,
+    horizon: int,
+    confidence_level: float
+) -> Dict:
+    """Parametric (normal) portfolio return, volatility and VaR over the horizon"""
+    covariance = daily_covariance * max(horizon, 1)
+    marginal = covariance @ weights
+    variance = float(weights @ marginal)
+    expected = float(weights @ expected_returns)
+    volatility = float(np.sqrt(max(variance, 0.0)))
+    z = NormalDist().inv_cdf(confidence_level)
+
+    return {
+        "expected_return": expected,
+        "volatility": volatility,
+        "value_at_risk": max(z * volatility - expected, 0.0),
+        "risk_contribution": (weights * marginal / variance if variance > 0 else np.zeros_like(weights)).tolist()
+    }
+
+# ===== METRICS =====
+
+metrics = MetricsRegistry()
+LAYER_SECONDS = metrics.histogram(
+    "bullrider_layer_seconds", "Layer compute time, including executor queueing", ("layer", "mode")
+)
+STAGE_SECONDS = metrics.histogram(
+    "bullrider_stage_seconds", "Trade-setup assembly and response serialization time", ("stage",)
+)
+REQUEST_SECONDS = metrics.histogram(
+    "bullrider_request_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+PREDICTIONS = metrics.counter(
+    "bullrider_predictions", "Prediction requests by endpoint and outcome", ("endpoint", "outcome")
+)
+
+# ===== LAYER EXECUTOR =====
+
+# When set (by WarmupScheduler), layer CPU seconds for the current task are added to it
+LAYER_CPU_METER: ContextVar[Optional[List[float]]] = ContextVar("layer_cpu_meter", default=None)
+
+
+def _timed_call(fn: Callable, *args):
+    """Run fn and return (result, CPU seconds this thread spent on it)"""
+    start = time.thread_time()
+    result = fn(*args)
+    return result, time.thread_time() - start
+
+
+class LayerExecutor:
+    """
+    Runs layer math off the event loop so one heavy prediction can't stall
+    every websocket. Each layer is dispatched by LAYER_EXECUTION to:
+    - "inline": on the event loop (trivial math)
+    - "thread": thread pool, for NumPy work that releases the GIL
+    - "process": process pool, for pure-Python model code that holds the GIL
+    A layer that exceeds the timeout raises TimeoutError; its worker keeps
+    running to completion, which shows up as queue depth.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int = LAYER_THREAD_WORKERS,
+        process_workers: int = LAYER_PROCESS_WORKERS,
+        timeout: float = LAYER_TIMEOUT,
+        modes: Optional[Dict[str, str]] = None
+    ):
+        self.timeout = timeout
+        self.modes = dict(LAYER_EXECUTION if modes is None else modes)
+        self.workers = {"thread": thread_workers, "process": process_workers}
+        self.pools = {
+            "thread": ThreadPoolExecutor(thread_workers, thread_name_prefix="layer") if thread_workers else None,
+            "process": ProcessPoolExecutor(process_workers) if process_workers else None
+        }
+        self.in_flight = {"thread": 0, "process": 0}
+        self.peak_in_flight = {"thread": 0, "process": 0}
+        self.completed = {"inline": 0, "thread": 0, "process": 0}
+        self.timeouts = {"thread": 0, "process": 0}
+
+    def mode_for(self, layer: str) -> str:
+        """Configured mode, falling back process -> thread -> inline when a pool is disabled"""
+        mode = self.modes.get(layer, "inline")
+        if mode == "process" and self.pools["process"] is None:
+            mode = "thread"
+        if mode == "thread" and self.pools["thread"] is None:
+            mode = "inline"
+        return mode
+
+    async def run(self, layer: str, fn: Callable, *args):
+        mode = self.mode_for(layer)
+        meter = LAYER_CPU_METER.get()
+        # Metered calls are timed in whichever thread or process runs them
+        call = (fn, *args) if meter is None else (_timed_call, fn, *args)
+        if mode == "inline":
+            self.completed["inline"] += 1
+            with LAYER_SECONDS.time(layer=layer, mode=mode):
+                result = call[0](*call[1:])
+            return result if meter is None else self._charge(meter, result)
+
+        loop = asyncio.get_running_loop()
+        self.in_flight[mode] += 1
+        self.peak_in_flight[mode] = max(self.peak_in_flight[mode], self.in_flight[mode])
+        try:
+            with LAYER_SECONDS.time(layer=layer, mode=mode):
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(self.pools[mode], *call), self.timeout
+                )
+        except asyncio.TimeoutError:
+            self.timeouts[mode] += 1
+            raise TimeoutError(f"Layer {layer} exceeded {self.timeout}s in {mode} pool")
+        finally:
+            self.in_flight[mode] -= 1
+
+        self.completed[mode] += 1
+        return result if meter is None else self._charge(meter, result)
+
+    @staticmethod
+    def _charge(meter: List[float], timed: Tuple):
+        result, cpu = timed
+        meter[0] += cpu
+        return result
+
+    def stats(self) -> Dict:
+        stats = {
+            mode: {
+                "workers": self.workers[mode],
+                "in_flight": self.in_flight[mode],
+                "queue_depth": max(self.in_flight[mode] - self.workers[mode], 0),
+                "peak_in_flight": self.peak_in_flight[mode],
+                "completed": self.completed[mode],
+                "timeouts": self.timeouts[mode]
+            }
+            for mode in ("thread", "process")
+        }
+        stats["inline"] = {"completed": self.completed["inline"]}
+        stats["timeout_seconds"] = self.timeout
+        return stats
+
+    def shutdown(self):
+        for pool in self.pools.values():
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+# ===== PER-LAYER MEMOIZATION =====
+
+class LayerMemo:
+    """
+    One TTL cache per layer, keyed on that layer's true inputs. Keys are
+    tuples whose first element is the ticker, and a per-layer ticker -> keys
+    index lets a refresh trigger evict one symbol's entries without scanning
+    the cache. Quote-dependent keys include the quote timestamp, so new
+    quotes never hit stale entries and those simply age out.
+    """
+
+    def __init__(self, maxsize: int = LAYER_MEMO_SIZE, ttl: float = CACHE_TTL):
+        self.caches = {layer: TTLCache(maxsize=maxsize, ttl=ttl) for layer in MEMOIZED_LAYERS}
+        self._by_ticker: Dict[str, Dict[str, set]] = {layer: {} for layer in MEMOIZED_LAYERS}
+        self._indexed = dict.fromkeys(MEMOIZED_LAYERS, 0)
+        self.hits = dict.fromkeys(MEMOIZED_LAYERS, 0)
+        self.misses = dict.fromkeys(MEMOIZED_LAYERS, 0)
+
+    async def get_or_compute(self, layer: str, key: Tuple, compute: Callable[[], Awaitable]):
+        cache = self.caches[layer]
+        value = cache.get(key)
+        if value is not None:
+            self.hits[layer] += 1
+            return value
+
+        self.misses[layer] += 1
+        value = await compute()
+        cache[key] = value
+        self._index(layer, key)
+        return value
+
+    def _index(self, layer: str, key: Tuple):
+        index = self._by_ticker[layer]
+        index.setdefault(key[0], set()).add(key)
+        self._indexed[layer] += 1
+        if self._indexed[layer] > 2 * self.caches[layer].maxsize:
+            # TTL expiry and LRU eviction bypass the index; rebuild it from the
+            # live keys once it holds twice as many, so upkeep stays O(1) amortized
+            index.clear()
+            for live in self.caches[layer].keys():
+                index.setdefault(live[0], set()).add(live)
+            self._indexed[layer] = len(self.caches[layer])
+
+    def invalidate(self, ticker: str, layers: Tuple[str, ...] = MEMOIZED_LAYERS):
+        for layer in layers:
+            cache = self.caches[layer]
+            if ticker == MARKET_WIDE:
+                cache.clear()
+                self._by_ticker[layer].clear()
+                self._indexed[layer] = 0
+                continue
+            keys = self._by_ticker[layer].pop(ticker, ())
+            self._indexed[layer] -= len(keys)
+            for key in keys:
+                cache.pop(key, None)
+
+    def stats(self) -> Dict:
+        return {
+            layer: {"size": len(self.caches[layer]), "hits": self.hits[layer], "misses": self.misses[layer]}
+            for layer in MEMOIZED_LAYERS
+        }
+
+# ===== PREDICTION CACHE =====
+
+@dataclass(slots=True)
+class CacheEntry:
+    symbol: str
+    value: object
+    request: "PredictionRequest"
+    stored_at: float
+    expires_at: float
+    representations: Dict[str, bytes] = field(default_factory=dict)  # encoded response bodies
+
+
+class PredictionCache:
+    """
+    Final predictions indexed by symbol, so a refresh trigger evicts exactly
+    the entries it affects instead of waiting out CACHE_TTL. Entries expire
+    after ttl seconds, except that a symbol with no trigger events in the last
+    quiet_ttl seconds keeps its entries in ttl-sized extensions up to quiet_ttl.
+    """
+
+    def __init__(
+        self,
+        events: Optional[TriggerEventBus] = None,
+        maxsize: int = MAX_CACHE_SIZE,
+        ttl: float = CACHE_TTL,
+        quiet_ttl: float = QUIET_CACHE_TTL,
+        timer: Callable[[], float] = time.time
+    ):
+        self.events = events
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.quiet_ttl = quiet_ttl
+        self.timer = timer
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._by_symbol: Dict[str, set] = {}
+        self.hits = 0
+        self.misses = 0
+        self.extended = 0
+        self.evicted_by_trigger = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and self.timer() < entry.expires_at
+
+    def values(self) -> List:
+        return [entry.value for entry in self._entries.values()]
+
+    def representation(self, key: str, value, variant: str, build: Callable[[], bytes]) -> bytes:
+        """
+        Encoded bytes for a cached value, built once and stored with its entry
+        (so they are dropped with it). Falls back to build() if value is no
+        longer the cached one.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.value is not value:
+            return build()
+        body = entry.representations.get(variant)
+        if body is None:
+            body = entry.representations[variant] = build()
+        return body
+
+    def time_to_expiry(self, key: str) -> Optional[float]:
+        """Seconds until get() would miss, counting quiet-symbol extensions; None if absent"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = self.timer()
+        expires_at = entry.expires_at
+        if self._quiet(entry.symbol, now):
+            expires_at = max(expires_at, entry.stored_at + self.quiet_ttl)
+        return expires_at - now
+
+    def _quiet(self, symbol: str, now: float) -> bool:
+        return self.events is not None and self.events.last_event(symbol) < now - self.quiet_ttl
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        now = self.timer()
+        if now >= entry.expires_at:
+            if now - entry.stored_at < self.quiet_ttl and self._quiet(entry.symbol, now):
+                entry.expires_at = min(now + self.ttl, entry.stored_at + self.quiet_ttl)
+                self.extended += 1
+            else:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value, request: "PredictionRequest"):
+        now = self.timer()
+        self._remove(key)
+        self._entries[key] = CacheEntry(request.ticker, value, request, now, now + self.ttl)
+        self._by_symbol.setdefault(request.ticker, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._by_symbol[entry.symbol]
+            keys.discard(key)
+            if not keys:
+                del self._by_symbol[entry.symbol]
+        return entry
+
+    def invalidate(self, symbol: str) -> List["PredictionRequest"]:
+        """Evict every entry for a symbol (all entries for MARKET_WIDE); returns their requests"""
+        if symbol == MARKET_WIDE:
+            keys = list(self._entries)
+        else:
+            keys = list(self._by_symbol.get(symbol, ()))
+        evicted = [self._remove(key).request for key in keys]
+        self.evicted_by_trigger += len(evicted)
+        return evicted
+
+    def stats(self) -> Dict:
+        return {
+            "size": len(self._entries),
+            "symbols": len(self._by_symbol),
+            "hits": self.hits,
+            "misses": self.misses,
+            "quiet_extensions": self.extended,
+            "evicted_by_trigger": self.evicted_by_trigger
+        }
+
+# ===== REQUEST FREQUENCY =====
+
+class RequestFrequency:
+    """
+    Exponentially decayed request counts per cache key. Scores decay lazily
+    on read, so record() is O(1); when more than max_keys are tracked the
+    coldest quarter is dropped.
+    """
+
+    def __init__(
+        self,
+        half_life: float = FREQUENCY_HALF_LIFE,
+        max_keys: int = FREQUENCY_MAX_KEYS,
+        timer: Callable[[], float] = time.time
+    ):
+        self.decay = math.log(2) / half_life
+        self.max_keys = max_keys
+        self.timer = timer
+        self._counts: Dict[str, Tuple[float, float]] = {}  # key -> (score, updated_at)
+        self._requests: Dict[str, "PredictionRequest"] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _decayed(self, key: str, now: float) -> float:
+        score, updated_at = self._counts[key]
+        return score * math.exp(-self.decay * (now - updated_at))
+
+    def record(self, key: str, request: "PredictionRequest"):
+        now = self.timer()
+        score = self._decayed(key, now) if key in self._counts else 0.0
+        self._counts[key] = (score + 1.0, now)
+        self._requests[key] = request
+        if len(self._counts) > self.max_keys:
+            for cold, _ in self.top(len(self._counts))[self.max_keys * 3 // 4:]:
+                del self._counts[cold]
+                del self._requests[cold]
+
+    def top(self, k: int) -> List[Tuple[str, "PredictionRequest"]]:
+        """The k most requested keys, hottest first"""
+        now = self.timer()
+        keys = heapq.nlargest(k, self._counts, key=lambda key: self._decayed(key, now))
+        return [(key, self._requests[key]) for key in keys]
 
 # ===== 7-LAYER PREDICTION ENGINE =====
 
+def _ignore_layer(name: str, layer: object):
+    """Default on_layer callback"""
+
+
 class SevenLayerPredictor:
     """Complete 7-Layer Quantum Prediction Engine"""
 
-    def __init__(self):
-        self.cache = TTLCache(maxsize=MAX_CACHE_SIZE, ttl=CACHE_TTL)
+    def __init__(
+        self,
+        quote_service: Optional[QuoteService] = None,
+        executor: Optional[LayerExecutor] = None,
+        bar_store: Optional[HistoricalBarStore] = None,
+        events: Optional[TriggerEventBus] = None
+    ):
+        # Refresh triggers evict and recompute exactly the affected symbols
+        self.events = events or (quote_service.events if quote_service else None) or TriggerEventBus()
+        self.events.subscribe(self._on_trigger)
+        self.cache = PredictionCache(self.events, maxsize=MAX_CACHE_SIZE)
+        self.layer_memo = LayerMemo()
+        self.frequency = RequestFrequency()
+        self.returns_cache = TTLCache(maxsize=LAYER_MEMO_SIZE, ttl=CACHE_TTL)  # (ticker, snapshot, lookback)
+        self._recompute_tasks = set()
+        # Quotes are batched, cached and coalesced across concurrent predictions
+        self.quotes = quote_service or QuoteService(
+            create_market_data_provider(RNG_SEED), events=self.events
+        )
+        self.executor = executor or LayerExecutor()
+        self.bar_store = bar_store
+        if bar_store is None and BAR_STORE_PATH:
+            self.bar_store = HistoricalBarStore(BAR_STORE_PATH)
         logger.info("🚀 Seven-Layer Prediction Engine initialized")
 
-    async def predict(self, request: PredictionRequest) -> PredictionResult:
-        """Run complete 7-layer prediction"""
+    async def predict(
+        self,
+        request: PredictionRequest,
+        refresh: bool = False,
+        on_layer: Optional[Callable[[str, object], None]] = None,
+        record: bool = True
+    ) -> PredictionResult:
+        """
+        Run complete 7-layer prediction. refresh=True recomputes without counting
+        as a request; record=False serves from the cache without counting as one
+        (portfolio constituents aren't user demand for warmup); on_layer(name,
+        layer) is called as each layer completes (replayed from the cached
+        result on a hit).
+        """
+        emit = on_layer or _ignore_layer
 
         # Check cache
-        cache_key = f"{request.ticker}:{request.horizon}:{request.analysis_type}"
-        if cache_key in self.cache:
-            logger.info(f"📦 Cache hit for {cache_key}")
-            return self.cache[cache_key]
+        cache_key = self.cache_key(request)
+        if not refresh:
+            if record:
+                self.frequency.record(cache_key, request)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"📦 Cache hit for {cache_key}")
+                for name in LAYER_NAMES:
+                    emit(name, getattr(cached, name))
+                return cached
 
         logger.info(f"🧠 Running 7-layer prediction for {request.ticker}")
 
+        intent, prime, pathways, resonance, quote, data_fusion, snapshot = (
+            await self._shared_layers(request, emit)
+        )
+
+        # Layers 6-7 depend on the horizon plus everything upstream
+        horizon_key = (request.ticker, snapshot, quote.timestamp, request.horizon)
+
+        # Layer 6: Echo Vision (7 Lenses)
+        vision = await self.layer_memo.get_or_compute(
+            "echo_vision", horizon_key,
+            lambda: self._layer_6_echo_vision(intent, prime, pathways, resonance, data_fusion)
+        )
+        logger.info(f"✅ Layer 6 Complete: {vision.synthesis_score:.1%} vision synthesis")
+        emit("echo_vision", vision)
+
+        # Layer 7: Temporal Anchoring
+        temporal = await self.layer_memo.get_or_compute(
+            "temporal_anchoring", horizon_key,
+            lambda: self._layer_7_temporal_anchoring(request, vision)
+        )
+        logger.info(f"✅ Layer 7 Complete: {temporal.calibration_score:.1%} calibration")
+        emit("temporal_anchoring", temporal)
+
+        # Assemble final prediction
+        with STAGE_SECONDS.time(stage="assemble"):
+            result = await self._assemble_prediction(
+                request, intent, prime, pathways, resonance, data_fusion, vision, temporal
+            )
+
+        # Cache result
+        self.cache.set(cache_key, result, request)
+        logger.info(f"💾 Cached prediction for {cache_key}")
+
+        return result
+
+    async def _shared_layers(
+        self,
+        request: PredictionRequest,
+        emit: Callable[[str, object], None] = _ignore_layer
+    ) -> Tuple:
+        """Layers 1-5; only layer 1 depends on the horizon"""
+
+        # Each layer is memoized on its true inputs, so horizon or risk-tolerance
+        # variants only recompute the layers downstream of what changed
+        snapshot = self._data_snapshot(request.ticker)
+        history_key = (request.ticker, snapshot)
+
         # Layer 1: Crystalline Intent
         intent = await self._layer_1_crystalline_intent(request)
         logger.info(f"✅ Layer 1 Complete: Intent clarity {intent.clarity_score:.1%}")
+        emit("crystalline_intent", intent)
 
         # Layer 2: Echo Prime (5 Frameworks)
-        prime = await self._layer_2_echo_prime(request, intent)
+        prime = await self.layer_memo.get_or_compute(
+            "echo_prime", history_key,
+            lambda: self._layer_2_echo_prime(request, intent, self._request_rng(request, snapshot))
+        )
         logger.info(f"✅ Layer 2 Complete: {prime.convergence_score:.1%} framework agreement")
+        emit("echo_prime", prime)
 
         # Layer 3: Parallel Pathways (5 Branches)
-        pathways = await self._layer_3_parallel_pathways(prime)
+        pathways = await self.layer_memo.get_or_compute(
+            "parallel_pathways", history_key,
+            lambda: self._layer_3_parallel_pathways(prime)
+        )
         logger.info(f"✅ Layer 3 Complete: {pathways.branch_voting}/5 pathways voting")
+        emit("parallel_pathways", pathways)
 
         # Layer 4: Echo Resonance (5 Voices)
-        resonance = await self._layer_4_echo_resonance(pathways, prime)
+        resonance = await self.layer_memo.get_or_compute(
+            "echo_resonance", history_key,
+            lambda: self._layer_4_echo_resonance(pathways, prime)
+        )
         logger.info(f"✅ Layer 4 Complete: {resonance.resonance_score:.1%} harmonic consensus")
+        emit("echo_resonance", resonance)
 
         # Layer 5: Real-Time Data Fusion
-        data_fusion = await self._layer_5_real_time_data(request)
+        quote = await self.quotes.get_quote(request.ticker)
+        data_fusion = await self.layer_memo.get_or_compute(
+            "real_time_data", (request.ticker, quote.timestamp),
+            lambda: self._layer_5_real_time_data(request, quote)
+        )
         logger.info(f"✅ Layer 5 Complete: {data_fusion.data_quality_score:.1%} data quality")
+        emit("real_time_data", data_fusion)
 
-        # Layer 6: Echo Vision (7 Lenses)
-        vision = await self._layer_6_echo_vision(
-            intent, prime, pathways, resonance, data_fusion
-        )
-        logger.info(f"✅ Layer 6 Complete: {vision.synthesis_score:.1%} vision synthesis")
+        return intent, prime, pathways, resonance, quote, data_fusion, snapshot
 
-        # Layer 7: Temporal Anchoring
-        temporal = await self._layer_7_temporal_anchoring(request, vision)
-        logger.info(f"✅ Layer 7 Complete: {temporal.calibration_score:.1%} calibration")
+    async def predict_term_structure(
+        self,
+        request: PredictionRequest,
+        refresh: bool = False
+    ) -> TermStructureResult:
+        """
+        Predict every horizon in request.horizons from one pass: layers 2-5 run
+        once, layers 6-7 and assembly are vectorized over the horizon array.
+        """
+        horizons = sorted(set(request.horizons))
+        cache_key = self.cache_key(request)
+        if not refresh:
+            self.frequency.record(cache_key, request)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"📦 Cache hit for {cache_key}")
+                return cached
+
+        logger.info(f"🧠 Running 7-layer term structure for {request.ticker} over {horizons}")
+
+        # Layer 1 (at the first horizon) through Layer 5
+        base_request = request.model_copy(update={"horizon": horizons[0]})
+        _, prime, pathways, resonance, _, data_fusion, _ = await self._shared_layers(base_request)
+
+        clarity = [
+            compute_crystalline_intent(request.ticker, h, request.analysis_type).clarity_score
+            for h in horizons
+        ]
 
-        # Assemble final prediction
-        result = await self._assemble_prediction(
-            request, intent, prime, pathways, resonance, data_fusion, vision, temporal
+        # Layers 6-7 over the whole horizon array
+        vision = await self.executor.run(
+            "echo_vision", compute_echo_vision_curve, horizons, resonance, data_fusion
         )
+        temporal = await self.executor.run(
+            "temporal_anchoring", compute_temporal_anchoring_curve, horizons, vision.synthesis_score
+        )
+        logger.info(f"✅ Layers 6-7 Complete for {len(horizons)} horizons")
 
-        # Cache result
-        self.cache[cache_key] = result
-        logger.info(f"💾 Cached prediction for {cache_key}")
-
-        return result
+        with STAGE_SECONDS.time(stage="assemble"):
+            curve = compute_trade_setup_curve(
+                np.asarray(clarity), prime, pathways, resonance, data_fusion,
+                lens_consensus(vision), np.asarray(vision.synthesis_score), np.asarray(temporal.calibration_score),
+                request.risk_tolerance
+            )
 
-    # ===== LAYER 1: CRYSTALLINE INTENT =====
-    async def _layer_1_crystalline_intent(self, request: PredictionRequest) -> CrystallineIntent:
-        """Clarify and refine the prediction question"""
+        now = datetime.now()
+        result = TermStructureResult(
+            ticker=request.ticker,
+            current_price=data_fusion.current_price,
+            horizons=horizons,
+            predicted_price=curve["predicted_price"].tolist(),
+            price_change_percent=curve["price_change_percent"].tolist(),
+            confidence=curve["confidence"].tolist(),
+            signal=[SignalType(signal) for signal in curve["signal"]],
+            entry_price=data_fusion.current_price,
+            stop_loss=curve["stop_loss"].tolist(),
+            target_1=curve["target_1"].tolist(),
+            target_2=curve["target_2"].tolist(),
+            risk_reward_ratio=curve["risk_reward_ratio"].tolist(),
+            echo_prime=prime,
+            parallel_pathways=pathways,
+            echo_resonance=resonance,
+            real_time_data=data_fusion,
+            clarity_score=clarity,
+            echo_vision=vision,
+            temporal_anchoring=temporal,
+            generated_at=now.isoformat(),
+            validity_until=[(now + timedelta(days=h)).isoformat() for h in horizons],
+            framework_agreement=curve["framework_agreement"].tolist()
+        )
 
-        # Analyze request ambiguity
-        clarity_factors = {
-            "ticker_clarity": 1.0 if len(request.ticker) <= 5 else 0.8,
-            "horizon_clarity": 1.0 if request.horizon > 0 else 0.5,
-            "type_clarity": 0.95,
-        }
+        # Cache the whole curve
+        self.cache.set(cache_key, result, request)
+        logger.info(f"💾 Cached term structure for {cache_key}")
 
-        clarity_score = np.mean(list(clarity_factors.values()))
+        return result
 
-        # Refine focus
-        refined_focus = f"{request.horizon}-day {request.analysis_type} prediction on {request.ticker}"
+    async def predict_portfolio(self, request: PortfolioRequest) -> PortfolioResult:
+        """
+        Predict every constituent, then aggregate with a covariance matrix built
+        from stored history. Constituents reuse the per-ticker prediction cache,
+        so overlapping portfolios only pay for names nobody has asked about.
+        """
+        tickers = list(dict.fromkeys(request.tickers))
+        if not tickers or len(tickers) > MAX_PORTFOLIO_SIZE:
+            raise ValueError(f"Portfolio must have 1-{MAX_PORTFOLIO_SIZE} unique tickers")
+        listed = request.weights if request.weights is not None else [1.0] * len(request.tickers)
+        if len(listed) != len(request.tickers):
+            raise ValueError("weights must match tickers one-to-one")
+        # A ticker listed more than once holds the sum of its weights
+        positions = {ticker: index for index, ticker in enumerate(tickers)}
+        weights = np.zeros(len(tickers))
+        np.add.at(weights, [positions[t] for t in request.tickers], listed)
+        if weights.sum() == 0:
+            raise ValueError("weights must not sum to zero")
+        weights = weights / weights.sum()
+
+        logger.info(f"🧠 Running portfolio prediction for {len(tickers)} tickers")
+
+        # One batched quote fetch, then per-ticker predictions (mostly cache hits)
+        await self.quotes.get_quotes(tickers)
+        results = await asyncio.gather(*(
+            self.predict(PredictionRequest(
+                ticker=ticker,
+                horizon=request.horizon,
+                analysis_type=request.analysis_type,
+                risk_tolerance=request.risk_tolerance
+            ), record=False)
+            for ticker in tickers
+        ))
+
+        # Diagonal fallback from implied volatility; stored history overrides it
+        implied_vol = np.array([r.real_time_data.volatility_smile for r in results])
+        covariance = np.diag(implied_vol ** 2 / TRADING_DAYS)
+        history = [self._history_returns(ticker, request.lookback) for ticker in tickers]
+        covered = [i for i, series in enumerate(history) if series is not None]
+        observations = 0
+        if covered:
+            returns = align_returns([history[i] for i in covered])
+            observations = len(returns)
+            if observations >= 2:
+                covariance[np.ix_(covered, covered)] = np.atleast_2d(np.cov(returns, rowvar=False))
+            else:
+                covered = []
+
+        risk = compute_portfolio_risk(
+            weights,
+            np.array([r.price_change_percent for r in results]) / 100,
+            covariance,
+            request.horizon,
+            request.confidence_level
+        )
+        logger.info(f"✅ Portfolio Complete: {risk['volatility']:.2%} volatility over {request.horizon}d")
 
-        return CrystallineIntent(
-            ticker=request.ticker,
+        return PortfolioResult(
+            tickers=tickers,
+            weights=weights.tolist(),
             horizon=request.horizon,
-            analysis_type=request.analysis_type,
-            clarity_score=clarity_score,
-            refined_focus=refined_focus
+            expected_returns=[r.price_change_percent / 100 for r in results],
+            confidence=[r.confidence for r in results],
+            signal=[r.signal for r in results],
+            risk_contribution=risk["risk_contribution"],
+            expected_return=risk["expected_return"],
+            volatility=risk["volatility"],
+            value_at_risk=risk["value_at_risk"],
+            confidence_level=request.confidence_level,
+            history_coverage=len(covered) / len(tickers),
+            observations=observations,
+            generated_at=datetime.now().isoformat()
         )
 
-    # ===== LAYER 2: ECHO PRIME (5 FRAMEWORKS) =====
-    async def _layer_2_echo_prime(self, request: PredictionRequest, intent: CrystallineIntent) -> EchoPrime:
-        """5 frameworks converge on prediction"""
-
-        # Base prediction (mock data - replace with real models)
-        base_price = 100.0 + np.random.normal(0, 5)
-
-        # 5 Framework predictions with slight variation
-        rationalist = base_price * (1 + np.random.normal(0, 0.02))  # Technical Analysis
-        empiricist = base_price * (1 + np.random.normal(0, 0.02))   # Historical
-        phenomenological = base_price * (1 + np.random.normal(0, 0.02))  # Psychology
-        systemic = base_price * (1 + np.random.normal(0, 0.02))     # Market Dynamics
-        quantum = base_price * (1 + np.random.normal(0, 0.02))      # ML Ensemble
-
-        # Calculate convergence
-        predictions = [rationalist, empiricist, phenomenological, systemic, quantum]
-        std_dev = np.std(predictions)
-        convergence = 1.0 - min(std_dev / np.mean(predictions), 1.0)
-
-        return EchoPrime(
-            rationalist_prediction=rationalist,
-            empiricist_prediction=empiricist,
-            phenomenological_prediction=phenomenological,
-            systemic_prediction=systemic,
-            quantum_prediction=quantum,
-            convergence_score=convergence
+    def _history_returns(self, ticker: str, lookback: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(timestamps, daily log returns) from the bar store, cached per data snapshot"""
+        snapshot = self._data_snapshot(ticker)
+        if not snapshot:
+            return None
+        key = (ticker, snapshot, lookback)
+        series = self.returns_cache.get(key)
+        if series is None:
+            bars = self.bar_store.tail(ticker, lookback + 1)
+            if len(bars) < 3:
+                return None
+            series = (np.array(bars.timestamp[1:]), np.diff(np.log(bars.close)))
+            self.returns_cache[key] = series
+        return series
+
+    def cache_key(self, request: PredictionRequest) -> str:
+        """
+        Prediction cache key. A term structure is keyed on its sorted, unique
+        horizons under its own "ts:" prefix, so it never collides with the
+        single-horizon PredictionResult for the same ticker.
+        """
+        suffix = f"{request.analysis_type}:{request.risk_tolerance}"
+        if request.horizons:
+            horizons = ",".join(map(str, sorted(set(request.horizons))))
+            return f"ts:{request.ticker}:{horizons}:{suffix}"
+        return f"{request.ticker}:{request.horizon}:{suffix}"
+
+    def _data_snapshot(self, ticker: str) -> int:
+        """Identity of the stored history behind a ticker (its last bar timestamp, 0 if none)"""
+        if self.bar_store is None:
+            return 0
+        return self.bar_store.last_timestamp(ticker) or 0
+
+    def _on_trigger(self, event: TriggerEvent):
+        """Evict everything an event touches, then refill the evicted predictions in the background"""
+        self.quotes.invalidate(event.symbol, before=event.timestamp)
+        self.layer_memo.invalidate(event.symbol, QUOTE_DEPENDENT_LAYERS)
+        evicted = self.cache.invalidate(event.symbol)
+        logger.info(f"🧹 {event.trigger}: evicted {len(evicted)} cached predictions for {event.symbol}")
+
+        if not (evicted and RECOMPUTE_ON_TRIGGER):
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._recompute(evicted))
+        except RuntimeError:
+            return  # published outside the event loop; entries refill on demand
+        self._recompute_tasks.add(task)
+        task.add_done_callback(self._recompute_tasks.discard)
+
+    async def _recompute(self, requests: List[PredictionRequest]):
+        # One at a time so a market-wide event can't flood the executor
+        for request in requests:
+            try:
+                await self.refresh(request)
+            except Exception as e:
+                logger.error(f"❌ Recompute failed for {request.ticker}: {e}")
+
+    async def refresh(self, request: PredictionRequest):
+        """Recompute and re-cache a prediction regardless of what is cached"""
+        if request.horizons:
+            return await self.predict_term_structure(request, refresh=True)
+        return await self.predict(request, refresh=True)
+
+    def _request_rng(self, request: PredictionRequest, snapshot: int = 0) -> np.random.Generator:
+        """Independent, reproducible random stream for one request and data snapshot"""
+        return np.random.default_rng(symbol_seed_sequence(RNG_SEED, request.ticker, snapshot))
+
+    # ===== LAYERS (dispatched through LayerExecutor) =====
+    async def _layer_1_crystalline_intent(self, request: PredictionRequest) -> CrystallineIntent:
+        return await self.executor.run(
+            "crystalline_intent", compute_crystalline_intent,
+            request.ticker, request.horizon, request.analysis_type
         )
 
-    # ===== LAYER 3: PARALLEL PATHWAYS (5 BRANCHES) =====
+    async def _layer_2_echo_prime(
+        self,
+        request: PredictionRequest,
+        intent: CrystallineIntent,
+        rng: np.random.Generator
+    ) -> EchoPrime:
+        return await self.executor.run("echo_prime", compute_echo_prime, rng)
+
     async def _layer_3_parallel_pathways(self, prime: EchoPrime) -> ParallelPathways:
-        """5 simultaneous prediction branches"""
-
-        base = np.mean([
-            prime.rationalist_prediction,
-            prime.empiricist_prediction,
-            prime.phenomenological_prediction,
-            prime.systemic_prediction,
-            prime.quantum_prediction
-        ])
-
-        conservative = base * 0.97  # -3% downside protection
-        probable = base * 1.00      # Most likely
-        optimistic = base * 1.025   # +2.5% upside
-        data_driven = base * 0.99   # Pure stats
-        ml_enhanced = base * 1.005  # Neural net
-
-        # Consensus
-        pathways = [conservative, probable, optimistic, data_driven, ml_enhanced]
-        consensus = np.median(pathways)
-
-        # Count agreement (within 2%)
-        agreement = sum(1 for p in pathways if abs(p - consensus) / consensus < 0.02)
-
-        return ParallelPathways(
-            conservative=conservative,
-            probable=probable,
-            optimistic=optimistic,
-            data_driven=data_driven,
-            ml_enhanced=ml_enhanced,
-            consensus_prediction=consensus,
-            branch_voting=agreement
-        )
+        return await self.executor.run("parallel_pathways", compute_parallel_pathways, prime)
 
-    # ===== LAYER 4: ECHO RESONANCE (5 VOICES) =====
     async def _layer_4_echo_resonance(self, pathways: ParallelPathways, prime: EchoPrime) -> EchoResonance:
-        """5 voices reach harmonic consensus"""
-
-        base = pathways.consensus_prediction
-
-        # 5 Voice perspectives
-        synthesizer = base * (1 + prime.convergence_score * 0.01)  # What all agree on
-        rationalist_voice = base * 0.99
-        creator_voice = base * 1.01  # New patterns
-        observer_voice = base  # Objective
-        questioner_voice = base * 0.995  # Critical thinking
-
-        voices = [synthesizer, rationalist_voice, creator_voice, observer_voice, questioner_voice]
-        harmonic = np.mean(voices)
-        resonance_std = np.std(voices)
-        resonance_score = 1.0 - min(resonance_std / harmonic, 1.0)
-
-        return EchoResonance(
-            synthesizer=synthesizer,
-            rationalist_voice=rationalist_voice,
-            creator_voice=creator_voice,
-            observer_voice=observer_voice,
-            questioner_voice=questioner_voice,
-            harmonic_consensus=harmonic,
-            resonance_score=resonance_score
-        )
+        return await self.executor.run("echo_resonance", compute_echo_resonance, pathways, prime)
 
-    # ===== LAYER 5: REAL-TIME DATA FUSION =====
-    async def _layer_5_real_time_data(self, request: PredictionRequest) -> RealTimeDataFusion:
-        """Live market inputs"""
-
-        # Mock market data - replace with real API calls (IEX Cloud, Polygon.io)
-        current_price = 100.0 + np.random.normal(0, 5)
-        volume = np.random.uniform(50_000_000, 200_000_000)
-        bid_ask_spread = np.random.uniform(0.01, 0.05)  # dollars
-        volatility_smile = np.random.uniform(0.15, 0.35)  # IV range
-        news_sentiment = np.random.uniform(-0.5, 0.5)  # -1 to +1
-        macro_indicators = np.random.uniform(0.3, 0.9)  # composite score
-
-        data_quality = np.mean([
-            1.0 if volume > 50_000_000 else 0.7,
-            1.0 if bid_ask_spread < 0.1 else 0.8,
-            0.9,  # volatility baseline
-            0.8 + (news_sentiment + 1) / 2 * 0.2,
-            macro_indicators
-        ])
-
-        return RealTimeDataFusion(
-            current_price=current_price,
-            volume=volume,
-            bid_ask_spread=bid_ask_spread,
-            volatility_smile=volatility_smile,
-            news_sentiment=news_sentiment,
-            macro_indicators=macro_indicators,
-            data_quality_score=data_quality
-        )
+    async def _layer_5_real_time_data(self, request: PredictionRequest, quote: Quote) -> RealTimeDataFusion:
+        return await self.executor.run("real_time_data", compute_real_time_data, quote)
 
-    # ===== LAYER 6: ECHO VISION (7 LENSES) =====
     async def _layer_6_echo_vision(
         self,
         intent: CrystallineIntent,
@@ -377,62 +1483,13 @@ class SevenLayerPredictor:
         resonance: EchoResonance,
         data: RealTimeDataFusion
     ) -> EchoVision:
-        """7 analytical lenses"""
-
-        base = resonance.harmonic_consensus
-
-        # 7 Perspectives
-        reductionist = base * 0.98   # Break into parts
-        holistic = base * 1.01       # System as whole
-        temporal = base * (1 + intent.horizon * 0.001)  # Time dynamics
-        structural = base * 0.99     # Relationships
-        functional = base * 1.00     # Purpose
-        energetic = base * (1 + data.volume / 500_000_000)  # Flow
-        quantum = base * (1 + data.volatility_smile / 2)  # Uncertainty
-
-        lenses = [reductionist, holistic, temporal, structural, functional, energetic, quantum]
-        synthesis = np.median(lenses)
-        synthesis_std = np.std(lenses)
-        synthesis_score = 1.0 - min(synthesis_std / synthesis, 1.0)
-
-        return EchoVision(
-            reductionist=reductionist,
-            holistic=holistic,
-            temporal=temporal,
-            structural=structural,
-            functional=functional,
-            energetic=energetic,
-            quantum=quantum,
-            synthesis_score=synthesis_score
+        return await self.executor.run(
+            "echo_vision", compute_echo_vision, intent, prime, pathways, resonance, data
         )
 
-    # ===== LAYER 7: TEMPORAL ANCHORING =====
     async def _layer_7_temporal_anchoring(self, request: PredictionRequest, vision: EchoVision) -> TemporalAnchoring:
-        """Time-aware calibration"""
-
-        validity_horizon = request.horizon
-        decay_curve = 0.95 ** (1 / validity_horizon)  # Exponential decay
-
-        refresh_triggers = [
-            "earnings_announcement",
-            "major_news",
-            "volatility_spike",
-            "market_correction"
-        ]
-
-        # Seasonality (simplified)
-        today = datetime.now()
-        month = today.month
-        seasonality = 0.95 + (1 - abs(month - 6.5) / 6.5) * 0.1  # Peak in June
-
-        calibration = (vision.synthesis_score + 0.85) / 2  # Blend with default
-
-        return TemporalAnchoring(
-            validity_horizon=validity_horizon,
-            decay_curve=decay_curve,
-            refresh_triggers=refresh_triggers,
-            seasonality_adjustment=seasonality,
-            calibration_score=calibration
+        return await self.executor.run(
+            "temporal_anchoring", compute_temporal_anchoring, request.horizon, vision
         )
 
     # ===== ASSEMBLE FINAL PREDICTION =====
@@ -449,50 +1506,12 @@ class SevenLayerPredictor:
     ) -> PredictionResult:
         """Assemble 7-layer prediction with trade setup"""
 
-        # Get consensus prediction
-        predicted_price = vision.synthesis_score  # This will be recalculated properly
-        current_price = data.current_price
-        price_change_pct = ((predicted_price - current_price) / current_price) * 100
-
-        # Calculate confidence (weighted average of all 7 layers)
-        confidence = (
-            intent.clarity_score * 0.15 +
-            prime.convergence_score * 0.15 +
-            pathways.branch_voting / 5 * 0.10 +
-            resonance.resonance_score * 0.12 +
-            data.data_quality_score * 0.08 +
-            vision.synthesis_score * 0.15 +
-            temporal.calibration_score * 0.25
-        )
-
-        # Determine signal
-        if confidence > 0.80 and price_change_pct > 0:
-            signal = SignalType.BULLISH
-        elif confidence > 0.80 and price_change_pct < 0:
-            signal = SignalType.BEARISH
-        else:
-            signal = SignalType.NEUTRAL
-
-        # Trade setup (Risk/Reward Analysis)
-        upside = abs(price_change_pct) * 1.3
-        downside = -abs(price_change_pct) * 0.9
-
-        entry_price = current_price
-        stop_loss = current_price * (1 + downside / 100)
-        target_1 = current_price * (1 + upside / 100)
-        target_2 = current_price * (1 + upside * 1.5 / 100)
-        risk_reward = upside / abs(downside) if downside != 0 else 0
-
-        # Framework agreement
-        frameworks_agreeing = (
-            (intent.clarity_score > 0.85) +
-            (prime.convergence_score > 0.85) +
-            (pathways.branch_voting >= 4) +
-            (resonance.resonance_score > 0.85) +
-            (data.data_quality_score > 0.80) +
-            (vision.synthesis_score > 0.85) +
-            (temporal.calibration_score > 0.80)
+        curve = compute_trade_setup_curve(
+            np.array([intent.clarity_score]), prime, pathways, resonance, data,
+            lens_consensus(vision), np.array([vision.synthesis_score]), np.array([temporal.calibration_score]),
+            request.risk_tolerance
         )
+        current_price = data.current_price
 
         now = datetime.now()
         validity = now + timedelta(days=request.horizon)
@@ -500,15 +1519,15 @@ class SevenLayerPredictor:
         return PredictionResult(
             ticker=request.ticker,
             current_price=current_price,
-            predicted_price=predicted_price,
-            price_change_percent=price_change_pct,
-            confidence=confidence,
-            signal=signal,
-            entry_price=entry_price,
-            stop_loss=stop_loss,
-            target_1=target_1,
-            target_2=target_2,
-            risk_reward_ratio=risk_reward,
+            predicted_price=float(curve["predicted_price"][0]),
+            price_change_percent=float(curve["price_change_percent"][0]),
+            confidence=float(curve["confidence"][0]),
+            signal=SignalType(curve["signal"][0]),
+            entry_price=current_price,
+            stop_loss=float(curve["stop_loss"][0]),
+            target_1=float(curve["target_1"][0]),
+            target_2=float(curve["target_2"][0]),
+            risk_reward_ratio=float(curve["risk_reward_ratio"][0]),
             crystalline_intent=intent,
             echo_prime=prime,
             parallel_pathways=pathways,
@@ -518,18 +1537,397 @@ class SevenLayerPredictor:
             temporal_anchoring=temporal,
             generated_at=now.isoformat(),
             validity_until=validity.isoformat(),
-            framework_agreement=frameworks_agreeing
+            framework_agreement=int(curve["framework_agreement"][0])
+        )
+
+# ===== PRECOMPUTE SCHEDULER =====
+
+class WarmupScheduler:
+    """
+    Background task that re-runs the top_k most requested predictions when
+    they are within lead_time seconds of expiring (or were evicted), so hot
+    keys are refreshed before a client can miss. Each pass spends at most
+    cpu_budget * interval CPU seconds on its own layer computations, metered
+    per thread through LAYER_CPU_METER so concurrent request handling doesn't
+    eat the budget; keys that don't fit wait for the next pass, hottest first.
+    """
+
+    def __init__(
+        self,
+        predictor: "SevenLayerPredictor",
+        top_k: int = WARMUP_TOP_K,
+        lead_time: float = WARMUP_LEAD_TIME,
+        interval: float = WARMUP_INTERVAL,
+        cpu_budget: float = WARMUP_CPU_BUDGET
+    ):
+        self.predictor = predictor
+        self.top_k = top_k
+        self.lead_time = lead_time
+        self.interval = interval
+        self.cpu_budget = cpu_budget
+        self._task: Optional[asyncio.Task] = None
+        self.passes = 0
+        self.refreshed = 0
+        self.deferred = 0
+        self.failed = 0
+        self.last_pass_cpu = 0.0
+
+    def start(self):
+        if self.top_k > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🔥 Warmup scheduler keeping top {self.top_k} keys warm")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Warmup pass failed: {e}")
+
+    async def run_once(self) -> int:
+        """One pass over the hot keys; returns how many were refreshed"""
+        budget = self.cpu_budget * self.interval
+        meter = [0.0]
+        refreshed = 0
+
+        token = LAYER_CPU_METER.set(meter)
+        try:
+            for key, request in self.predictor.frequency.top(self.top_k):
+                remaining = self.predictor.cache.time_to_expiry(key)
+                if remaining is not None and remaining > self.lead_time:
+                    continue
+                if meter[0] >= budget:
+                    self.deferred += 1
+                    continue
+
+                try:
+                    await self.predictor.refresh(request)
+                    refreshed += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"❌ Warmup failed for {key}: {e}")
+        finally:
+            LAYER_CPU_METER.reset(token)
+
+        self.passes += 1
+        self.refreshed += refreshed
+        self.last_pass_cpu = meter[0]
+        return refreshed
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._task is not None,
+            "tracked_keys": len(self.predictor.frequency),
+            "passes": self.passes,
+            "refreshed": self.refreshed,
+            "deferred": self.deferred,
+            "failed": self.failed,
+            "last_pass_cpu_seconds": self.last_pass_cpu
+        }
+
+# ===== ADMISSION CONTROL =====
+
+@dataclass(slots=True)
+class TokenBucket:
+    rate: float    # tokens per second
+    burst: float   # capacity
+    tokens: float
+    updated_at: float
+
+    def try_acquire(self, now: float) -> float:
+        """Take one token; returns 0.0 on success, else seconds until one is available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """One token bucket per key (client address, API key). A rate <= 0 admits everything."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int = RATE_LIMIT_MAX_KEYS,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_keys = max_keys
+        self.timer = timer
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def bucket(self) -> Optional[TokenBucket]:
+        """A standalone full bucket, or None when limiting is disabled"""
+        if self.rate <= 0:
+            return None
+        return TokenBucket(self.rate, self.burst, self.burst, self.timer())
+
+    def check(self, key: str) -> float:
+        """0.0 if admitted, else the Retry-After in seconds"""
+        if self.rate <= 0:
+            return 0.0
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = self.bucket()
+            # An idle bucket refills to full, so forgetting the oldest loses nothing
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.try_acquire(self.timer())
+
+
+class AdmissionController:
+    """
+    Rejects work up front instead of queueing it: token buckets per client and
+    per API key (429), and a global cap on in-flight requests (503). Both carry
+    a Retry-After so well-behaved clients back off.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        client_rate: float = CLIENT_RATE_LIMIT,
+        client_burst: float = CLIENT_BURST,
+        api_key_rate: float = API_KEY_RATE_LIMIT,
+        api_key_burst: float = API_KEY_BURST,
+        ws_message_rate: float = WS_MESSAGE_RATE_LIMIT,
+        ws_message_burst: float = WS_MESSAGE_BURST
+    ):
+        self.max_in_flight = max_in_flight
+        self.clients = RateLimiter(client_rate, client_burst)
+        self.api_keys = RateLimiter(api_key_rate, api_key_burst)
+        self.ws_messages = RateLimiter(ws_message_rate, ws_message_burst)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.rejected = {"client_rate": 0, "api_key_rate": 0, "overloaded": 0, "ws_message_rate": 0}
+
+    def check_rate(self, client: str, api_key: Optional[str]) -> Optional[Tuple[int, str, float]]:
+        """None if within limits, else (status, reason, retry_after)"""
+        wait = self.clients.check(client)
+        if wait:
+            self.rejected["client_rate"] += 1
+            return 429, "client_rate", wait
+        if api_key:
+            wait = self.api_keys.check(api_key)
+            if wait:
+                self.rejected["api_key_rate"] += 1
+                return 429, "api_key_rate", wait
+        return None
+
+    def try_enter(self) -> bool:
+        if self.max_in_flight > 0 and self.in_flight >= self.max_in_flight:
+            self.rejected["overloaded"] += 1
+            return False
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.admitted += 1
+        return True
+
+    def leave(self):
+        self.in_flight -= 1
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_in_flight": self.max_in_flight,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected)
+        }
+
+
+def client_id(connection) -> str:
+    """Rate-limit identity for a Request or WebSocket"""
+    return connection.client.host if connection.client else "unknown"
+
+
+def rejection_response(status: int, reason: str, retry_after: float) -> JSONResponse:
+    message = "Rate limit exceeded" if status == 429 else "Server overloaded"
+    return JSONResponse(
+        status_code=status,
+        content={"success": False, "message": message, "prediction": None, "error": reason},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI admission control for HTTP requests. Unlike a BaseHTTPMiddleware,
+    which returns once the response headers are out, it holds the in-flight
+    slot until the app has sent the final body message, so SSE streams and
+    long bodies count against the cap for as long as they run.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in ADMISSION_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        rejection = admission.check_rate(client_id(request), request.headers.get(API_KEY_HEADER))
+        if rejection is not None:
+            await rejection_response(*rejection)(scope, receive, send)
+            return
+        if not admission.try_enter():
+            await rejection_response(503, "overloaded", 1.0)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.leave()
+
+# ===== CONDITIONAL GET & COMPRESSION =====
+
+def entity_tag(cache_key: str, generated_at: str) -> str:
+    """Weak ETag: identifies the prediction, whichever encoding carries it"""
+    digest = hashlib.blake2b(f"{cache_key}|{generated_at}".encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def modified_at(generated_at: str) -> datetime:
+    """generated_at (local time, ISO format) as a whole-second UTC datetime"""
+    return datetime.fromisoformat(generated_at).astimezone(timezone.utc).replace(microsecond=0)
+
+
+def is_not_modified(request: Request, etag: str, modified: datetime) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins over If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return modified <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """Best supported content coding: br, then gzip, else identity"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    def acceptable(coding: str) -> bool:
+        return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+    if BROTLI_AVAILABLE and acceptable("br"):
+        return "br"
+    if acceptable("gzip"):
+        return "gzip"
+    return "identity"
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    with STAGE_SECONDS.time(stage=f"compress_{encoding}"):
+        if encoding == "br":
+            return brotli.compress(body, quality=BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encoded_response(
+    request: Request,
+    cache_key: str,
+    result,
+    variant: str,
+    build: Callable[[], bytes]
+) -> Response:
+    """
+    JSON response for a cached prediction with ETag/Last-Modified validators.
+    GET requests that still match get 304; otherwise the body (and its gzip or
+    brotli form) is encoded once and reused until the cache entry changes.
+    """
+    etag = entity_tag(cache_key, result.generated_at)
+    modified = modified_at(result.generated_at)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(modified, usegmt=True),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if request.method in ("GET", "HEAD") and is_not_modified(request, etag, modified):
+        return Response(status_code=304, headers=headers)
+
+    body = predictor.cache.representation(cache_key, result, variant, build)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding != "identity" and len(body) >= COMPRESS_MIN_BYTES:
+        identity = body
+        body = predictor.cache.representation(
+            cache_key, result, f"{variant}:{encoding}", lambda: compress(identity, encoding)
         )
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def json_bytes(payload: Dict) -> bytes:
+    with STAGE_SECONDS.time(stage="json_render"):
+        return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
 
 # ===== FASTAPI APP =====
 
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records how long rendering the body takes"""
+
+    def render(self, content) -> bytes:
+        with STAGE_SECONDS.time(stage="json_render"):
+            return super().render(content)
+
+
 app = FastAPI(
     title="BearTamer / BullRider API",
     description="7-Layer Quantum Stock Market Prediction Engine",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=TimedJSONResponse
 )
 
-# CORS
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Route templates (/layers/{ticker}) keep label cardinality bounded
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code
+    )
+    return response
+
+# Added after the latency middleware, so it runs first and rejections stay cheap
+app.add_middleware(AdmissionMiddleware)
+
+# CORS, added last so it is outermost: 429/503 rejections from AdmissionMiddleware
+# carry Access-Control-Allow-Origin, and preflights never spend admission tokens
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -540,6 +1938,37 @@ app.add_middleware(
 
 # Initialize predictor
 predictor = SevenLayerPredictor()
+warmup = WarmupScheduler(predictor)
+admission = AdmissionController()
+
+
+def collect_cache_metrics() -> List:
+    """Hit/miss counters the caches already keep, read at scrape time"""
+    cache = predictor.cache.stats()
+    memo = predictor.layer_memo.stats()
+    quotes = predictor.quotes.stats()
+    executor = predictor.executor.stats()
+    return [
+        ("bullrider_prediction_cache_hits_total", "counter", "Prediction cache hits",
+         [({}, cache["hits"])]),
+        ("bullrider_prediction_cache_misses_total", "counter", "Prediction cache misses",
+         [({}, cache["misses"])]),
+        ("bullrider_prediction_cache_entries", "gauge", "Cached predictions",
+         [({}, cache["size"])]),
+        ("bullrider_layer_memo_hits_total", "counter", "Per-layer memo hits",
+         [({"layer": layer}, stats["hits"]) for layer, stats in memo.items()]),
+        ("bullrider_layer_memo_misses_total", "counter", "Per-layer memo misses",
+         [({"layer": layer}, stats["misses"]) for layer, stats in memo.items()]),
+        ("bullrider_quote_cache_hits_total", "counter", "Quote cache hits",
+         [({}, quotes["hits"])]),
+        ("bullrider_quote_cache_misses_total", "counter", "Quote cache misses",
+         [({}, quotes["misses"])]),
+        ("bullrider_executor_in_flight", "gauge", "Layers running or queued per pool",
+         [({"pool": pool}, executor[pool]["in_flight"]) for pool in ("thread", "process")])
+    ]
+
+
+metrics.register_collector(collect_cache_metrics)
 
 # ===== API ENDPOINTS =====
 
@@ -549,55 +1978,210 @@ async def health_check():
     return {
         "status": "ok",
         "service": "BearTamer/BullRider 7-Layer Prediction Engine",
+        "market_data": predictor.quotes.stats(),
+        "executor": predictor.executor.stats(),
+        "layer_memo": predictor.layer_memo.stats(),
+        "prediction_cache": predictor.cache.stats(),
+        "events": predictor.events.stats(),
+        "warmup": warmup.stats(),
+        "admission": admission.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/predict", response_model=PredictionResponse)
-async def predict(request: PredictionRequest):
-    """Get 7-layer prediction for a stock"""
+async def predict(request: PredictionRequest, http_request: Request, profile: bool = False):
+    """Get 7-layer prediction for a stock (?profile=1 adds a profiler summary)"""
     try:
-        result = await predictor.predict(request)
+        if request.horizons:
+            work = predictor.predict_term_structure(request)
+            message = f"✅ 7-layer term structure complete for {request.ticker}"
+        else:
+            work = predictor.predict(request)
+            message = f"✅ 7-layer prediction complete for {request.ticker}"
+
+        summary = None
+        if profile:
+            result, summary = await profile_awaitable(work)
+        else:
+            result = await work
+
+        PREDICTIONS.inc(endpoint="predict", outcome="success")
+
+        def build() -> bytes:
+            with STAGE_SECONDS.time(stage="asdict"):
+                payload = asdict(result)
+            response = PredictionResponse(success=True, message=message, prediction=payload, profile=summary)
+            with STAGE_SECONDS.time(stage="json_render"):
+                return response.model_dump_json().encode()
+
+        if summary is not None:
+            return Response(build(), media_type="application/json")
+        return encoded_response(http_request, predictor.cache_key(request), result, "predict", build)
+    except Exception as e:
+        PREDICTIONS.inc(endpoint="predict", outcome="error")
+        logger.error(f"❌ Prediction error: {e}")
+        return PredictionResponse(
+            success=False,
+            message="Prediction failed",
+            prediction=None,
+            error=str(e)
+        )
+
+@app.post("/portfolio", response_model=PredictionResponse)
+async def predict_portfolio(request: PortfolioRequest):
+    """Portfolio expected return, volatility and VaR for 1-500 tickers"""
+    try:
+        result = await predictor.predict_portfolio(request)
+        PREDICTIONS.inc(endpoint="portfolio", outcome="success")
         return PredictionResponse(
             success=True,
-            message=f"✅ 7-layer prediction complete for {request.ticker}",
+            message=f"✅ Portfolio prediction complete for {len(result.tickers)} tickers",
             prediction=asdict(result)
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"❌ Prediction error: {e}")
+        PREDICTIONS.inc(endpoint="portfolio", outcome="error")
+        logger.error(f"❌ Portfolio error: {e}")
         return PredictionResponse(
             success=False,
-            message="Prediction failed",
+            message="Portfolio prediction failed",
             prediction=None,
             error=str(e)
         )
 
+@app.post("/events")
+async def publish_event(event: TriggerEventRequest):
+    """Publish a refresh trigger (earnings calendar, news feed, ...) for a symbol or "*" (market-wide)"""
+    try:
+        published = predictor.events.publish(event.symbol, event.trigger, event.detail)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "event": asdict(published)}
+
+@app.get("/predict/stream/{ticker}")
+async def predict_stream(
+    ticker: str,
+    horizon: int = 7,
+    analysis_type: str = "ensemble",
+    risk_tolerance: str = "moderate"
+):
+    """
+    Server-Sent Events: one `layer` event per layer as it completes, then a
+    `prediction` event with the assembled result (or an `error` event).
+    """
+    request = PredictionRequest(
+        ticker=ticker,
+        horizon=horizon,
+        analysis_type=analysis_type,
+        risk_tolerance=risk_tolerance
+    )
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def sse(event: str, payload: Dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+    async def events():
+        started = time.perf_counter()
+        # Runs to completion (and caches) even if the client disconnects
+        task = asyncio.create_task(predictor.predict(
+            request, on_layer=lambda name, layer: queue.put_nowait((name, layer))
+        ))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        while (item := await queue.get()) is not None:
+            name, layer = item
+            yield sse("layer", {
+                "layer": LAYER_NAMES.index(name) + 1,
+                "name": name,
+                "elapsed_ms": (time.perf_counter() - started) * 1000,
+                "data": asdict(layer)
+            })
+
+        try:
+            result = task.result()
+        except Exception as e:
+            logger.error(f"❌ Streaming prediction error: {e}")
+            yield sse("error", {"message": "Prediction failed", "error": str(e)})
+            return
+        yield sse("prediction", {
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+            "data": asdict(result)
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/layers/{ticker}")
-async def get_layers(ticker: str, horizon: int = 7):
-    """Get detailed breakdown of all 7 layers"""
+async def get_layers(
+    http_request: Request,
+    ticker: str,
+    horizon: int = 7,
+    horizons: Optional[List[int]] = Query(None)
+):
+    """
+    Get detailed breakdown of all 7 layers (?horizons=1&horizons=30 for a term structure).
+    Supports If-None-Match / If-Modified-Since polling and gzip/brotli.
+    """
     try:
-        request = PredictionRequest(ticker=ticker, horizon=horizon)
-        result = await predictor.predict(request)
+        if horizons:
+            request = PredictionRequest(ticker=ticker, horizons=horizons)
+            result = await predictor.predict_term_structure(request)
+        else:
+            request = PredictionRequest(ticker=ticker, horizon=horizon)
+            result = await predictor.predict(request)
 
-        return {
-            "ticker": ticker,
-            "layers": {
-                "1_crystalline_intent": asdict(result.crystalline_intent),
-                "2_echo_prime": asdict(result.echo_prime),
-                "3_parallel_pathways": asdict(result.parallel_pathways),
-                "4_echo_resonance": asdict(result.echo_resonance),
-                "5_real_time_data": asdict(result.real_time_data),
-                "6_echo_vision": asdict(result.echo_vision),
-                "7_temporal_anchoring": asdict(result.temporal_anchoring)
-            }
-        }
+        def build() -> bytes:
+            if horizons:
+                return json_bytes({
+                    "ticker": ticker,
+                    "horizons": result.horizons,
+                    "layers": {
+                        "1_clarity_score": result.clarity_score,
+                        "2_echo_prime": asdict(result.echo_prime),
+                        "3_parallel_pathways": asdict(result.parallel_pathways),
+                        "4_echo_resonance": asdict(result.echo_resonance),
+                        "5_real_time_data": asdict(result.real_time_data),
+                        "6_echo_vision": asdict(result.echo_vision),
+                        "7_temporal_anchoring": asdict(result.temporal_anchoring)
+                    }
+                })
+            return json_bytes({
+                "ticker": ticker,
+                "layers": {
+                    "1_crystalline_intent": asdict(result.crystalline_intent),
+                    "2_echo_prime": asdict(result.echo_prime),
+                    "3_parallel_pathways": asdict(result.parallel_pathways),
+                    "4_echo_resonance": asdict(result.echo_resonance),
+                    "5_real_time_data": asdict(result.real_time_data),
+                    "6_echo_vision": asdict(result.echo_vision),
+                    "7_temporal_anchoring": asdict(result.temporal_anchoring)
+                }
+            })
+
+        return encoded_response(http_request, predictor.cache_key(request), result, "layers", build)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.websocket("/ws/predict/{ticker}")
 async def websocket_predictions(websocket: WebSocket, ticker: str):
     """WebSocket for real-time predictions"""
+    rejection = admission.check_rate(client_id(websocket), websocket.headers.get(API_KEY_HEADER))
+    if rejection is not None:
+        await websocket.close(code=1013)  # try again later
+        return
+
     await websocket.accept()
     logger.info(f"📡 WebSocket connected for {ticker}")
+    messages = admission.ws_messages.bucket()
 
     try:
         while True:
@@ -605,6 +2189,16 @@ async def websocket_predictions(websocket: WebSocket, ticker: str):
             data = await websocket.receive_json()
             horizon = data.get("horizon", 7)
 
+            # Over-rate messages and overload are answered, not queued
+            wait = messages.try_acquire(time.monotonic()) if messages else 0.0
+            if wait:
+                admission.rejected["ws_message_rate"] += 1
+                await websocket.send_json({"error": "rate_limited", "retry_after": wait})
+                continue
+            if not admission.try_enter():
+                await websocket.send_json({"error": "overloaded", "retry_after": 1.0})
+                continue
+
             # Generate prediction
             request = PredictionRequest(
                 ticker=ticker,
@@ -613,7 +2207,10 @@ async def websocket_predictions(websocket: WebSocket, ticker: str):
                 risk_tolerance=data.get("risk_tolerance", "moderate")
             )
 
-            result = await predictor.predict(request)
+            try:
+                result = await predictor.predict(request)
+            finally:
+                admission.leave()
 
             # Send prediction
             await websocket.send_json({
@@ -640,12 +2237,16 @@ async def websocket_predictions(websocket: WebSocket, ticker: str):
 async def startup():
     """Initialize on startup"""
     logger.info("🚀 BearTamer/BullRider 7-Layer Prediction Engine starting...")
+    warmup.start()
     logger.info("✅ FastAPI server ready")
 
 @app.on_event("shutdown")
 async def shutdown():
     """Cleanup on shutdown"""
     logger.info("🛑 Shutting down BearTamer/BullRider...")
+    await warmup.stop()
+    await predictor.quotes.close()
+    predictor.executor.shutdown()
 
 # ===== MAIN =====
 
@@ -654,5 +2255,6 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=8000,
-        log_level="info"
+        log_level="info",
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE
     )
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+BearTamer / BullRider - Market Data Providers
+Copyright (c) 2025 Joshua Hendricks Cole (DBA: Corporation of Light). All Rights Reserved. PATENT PENDING.
+
+Pluggable quote sources for Layer 5 (Real-Time Data Fusion):
+- MarketDataProvider: batched get_quotes(tickers) interface every source implements
+- HTTPMarketDataProvider: live REST feed over a pooled httpx.AsyncClient
+- ReplayMarketDataProvider: serves recorded quotes from a JSONL file (offline load tests)
+- SyntheticMarketDataProvider: the original mock distribution, used when nothing is configured
+- QuoteService: short-TTL per-symbol cache with request coalescing in front of any provider
+- TriggerEventBus: per-symbol refresh-trigger events (earnings, news, volatility, corrections)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import httpx
+import numpy as np
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+QUOTE_TTL = 2.0  # seconds a quote is served from cache
+QUOTE_CACHE_SIZE = 10_000
+COALESCE_WINDOW = 0.005  # seconds to gather concurrent requests into one batch
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE = 10
+HTTP_TIMEOUT = 5.0  # seconds
+HTTP_MAX_BATCH_SIZE = 100  # symbols per upstream request
+VOLATILITY_SPIKE_THRESHOLD = float(os.getenv("BULLRIDER_VOLATILITY_SPIKE", "0.1"))  # fractional move, 0 = off
+
+# Events that invalidate predictions; TemporalAnchoring.refresh_triggers lists these
+REFRESH_TRIGGERS = (
+    "earnings_announcement",
+    "major_news",
+    "volatility_spike",
+    "market_correction"
+)
+MARKET_WIDE = "*"  # event symbol that applies to every symbol
+
+# Synthetic quote ranges: spread ($), volume, implied vol, news sentiment, macro score
+SYNTHETIC_LOW = np.array([0.01, 50_000_000, 0.15, -0.5, 0.3])
+SYNTHETIC_HIGH = np.array([0.05, 200_000_000, 0.35, 0.5, 0.9])
+# Synthetic prices walk from a N(100, 5) start with this per-quote log-return
+# std, reflected back into the band so they never drift to zero or run away
+SYNTHETIC_STEP_VOL = 0.002
+SYNTHETIC_PRICE_BAND = (50.0, 200.0)
+
+
+def symbol_seed_sequence(seed: Optional[int], symbol: str, *extra: int) -> np.random.SeedSequence:
+    """
+    SeedSequence for one symbol, stable across processes (crc32, not hash()).
+    Extra integers (e.g. a data snapshot timestamp) derive independent streams.
+    """
+    return np.random.SeedSequence(seed, spawn_key=(zlib.crc32(symbol.encode()), *extra))
+
+# ===== DATA MODELS =====
+
+@dataclass(slots=True)
+class Quote:
+    """Point-in-time market snapshot for one symbol"""
+    symbol: str
+    price: float
+    volume: float
+    bid: float
+    ask: float
+    implied_volatility: float
+    news_sentiment: float  # -1 to +1
+    macro_score: float     # 0-1 composite
+    timestamp: float       # epoch seconds
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Quote":
+        return cls(
+            symbol=str(data["symbol"]),
+            price=float(data["price"]),
+            volume=float(data.get("volume", 0.0)),
+            bid=float(data.get("bid", data["price"])),
+            ask=float(data.get("ask", data["price"])),
+            implied_volatility=float(data.get("implied_volatility", 0.0)),
+            news_sentiment=float(data.get("news_sentiment", 0.0)),
+            macro_score=float(data.get("macro_score", 0.5)),
+            timestamp=float(data.get("timestamp", time.time()))
+        )
+
+
+@dataclass(slots=True)
+class TriggerEvent:
+    """A refresh trigger observed for one symbol (or MARKET_WIDE)"""
+    symbol: str
+    trigger: str
+    timestamp: float  # epoch seconds
+    detail: Optional[str] = None
+
+# ===== REFRESH TRIGGERS =====
+
+class TriggerEventBus:
+    """
+    Synchronous publish/subscribe for refresh triggers. Providers and the
+    /events endpoint publish; caches subscribe and evict what an event
+    affects. The bus also remembers when each symbol last had an event so
+    caches can hold results longer for quiet symbols.
+    """
+
+    def __init__(self):
+        self.subscribers: List[Callable[[TriggerEvent], None]] = []
+        self._last_event: Dict[str, float] = {}
+        self.published = dict.fromkeys(REFRESH_TRIGGERS, 0)
+
+    def subscribe(self, callback: Callable[[TriggerEvent], None]):
+        self.subscribers.append(callback)
+
+    def publish(
+        self,
+        symbol: str,
+        trigger: str,
+        detail: Optional[str] = None,
+        timestamp: Optional[float] = None
+    ) -> TriggerEvent:
+        if trigger not in REFRESH_TRIGGERS:
+            raise ValueError(f"Unknown refresh trigger: {trigger}")
+
+        event = TriggerEvent(symbol, trigger, time.time() if timestamp is None else timestamp, detail)
+        self._last_event[symbol] = max(self._last_event.get(symbol, 0.0), event.timestamp)
+        self.published[trigger] += 1
+        logger.info(f"⚡ {trigger} for {symbol}" + (f": {detail}" if detail else ""))
+
+        for callback in self.subscribers:
+            callback(event)
+        return event
+
+    def last_event(self, symbol: str) -> float:
+        """Time of the latest event affecting a symbol, 0.0 if none"""
+        return max(self._last_event.get(symbol, 0.0), self._last_event.get(MARKET_WIDE, 0.0))
+
+    def stats(self) -> Dict:
+        return {"published": dict(self.published), "symbols_with_events": len(self._last_event)}
+
+# ===== PROVIDERS =====
+
+class MarketDataProvider(ABC):
+    """
+    Source of quotes. Implementations must not block the event loop.
+    Providers that learn of refresh triggers publish them on `events`,
+    which QuoteService attaches.
+    """
+
+    events: Optional[TriggerEventBus] = None
+
+    @abstractmethod
+    async def get_quotes(self, tickers: Sequence[str]) -> Dict[str, Quote]:
+        """Fetch the latest quote for each ticker. Unknown tickers are omitted."""
+
+    async def close(self):
+        """Release network resources"""
+
+
+class SyntheticMarketDataProvider(MarketDataProvider):
+    """
+    Random quotes drawn from the engine's original mock distribution.
+    Prices are a bounded random walk continuing from each symbol's last
+    quote, so refreshes move by fractions of a percent instead of tripping
+    volatility_spike. Each symbol has its own seeded stream, so a symbol's
+    quote sequence is reproducible regardless of which other symbols share
+    its batch.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self._rngs: Dict[str, np.random.Generator] = {}
+        self._prices: Dict[str, float] = {}
+
+    def _rng(self, ticker: str) -> np.random.Generator:
+        rng = self._rngs.get(ticker)
+        if rng is None:
+            rng = np.random.default_rng(symbol_seed_sequence(self.seed, ticker))
+            self._rngs[ticker] = rng
+        return rng
+
+    def _next_price(self, ticker: str, rng: np.random.Generator) -> float:
+        low, high = SYNTHETIC_PRICE_BAND
+        previous = self._prices.get(ticker)
+        if previous is None:
+            price = 100.0 + float(rng.normal(0, 5))
+        else:
+            price = previous * float(np.exp(rng.normal(0, SYNTHETIC_STEP_VOL)))
+        if price < low:
+            price = low * low / price
+        elif price > high:
+            price = high * high / price
+        self._prices[ticker] = price
+        return price
+
+    async def get_quotes(self, tickers: Sequence[str]) -> Dict[str, Quote]:
+        now = time.time()
+        result = {}
+
+        for ticker in tickers:
+            rng = self._rng(ticker)
+            price = self._next_price(ticker, rng)
+            spread, volume, implied_vol, sentiment, macro = rng.uniform(SYNTHETIC_LOW, SYNTHETIC_HIGH)
+            result[ticker] = Quote(
+                symbol=ticker,
+                price=price,
+                volume=float(volume),
+                bid=price - float(spread) / 2,
+                ask=price + float(spread) / 2,
+                implied_volatility=float(implied_vol),
+                news_sentiment=float(sentiment),
+                macro_score=float(macro),
+                timestamp=now
+            )
+
+        return result
+
+
+class ReplayMarketDataProvider(MarketDataProvider):
+    """
+    Serves recorded quotes from a JSONL file, one Quote per line.
+    Each get_quotes call advances that symbol to its next recorded quote,
+    wrapping around at the end when loop=True.
+    """
+
+    def __init__(self, path: str, loop: bool = True):
+        self.path = path
+        self.loop = loop
+        self._quotes: Dict[str, List[Quote]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    quote = Quote.from_dict(json.loads(line))
+                    self._quotes[quote.symbol].append(quote)
+
+        for quotes in self._quotes.values():
+            quotes.sort(key=lambda q: q.timestamp)
+
+        logger.info(f"📼 Loaded replay quotes for {len(self._quotes)} symbols from {path}")
+
+    async def get_quotes(self, tickers: Sequence[str]) -> Dict[str, Quote]:
+        result = {}
+        for ticker in tickers:
+            quotes = self._quotes.get(ticker)
+            if not quotes:
+                continue
+            cursor = self._cursor[ticker]
+            if cursor >= len(quotes):
+                if not self.loop:
+                    result[ticker] = quotes[-1]
+                    continue
+                cursor = 0
+            result[ticker] = quotes[cursor]
+            self._cursor[ticker] = cursor + 1
+        return result
+
+
+class HTTPMarketDataProvider(MarketDataProvider):
+    """
+    Live quotes from a REST endpoint over a pooled keep-alive client.
+
+    Expects GET {base_url}/quotes?symbols=AAPL,MSFT to return
+    {"quotes": [{"symbol": ..., "price": ..., ...}, ...]} using Quote field names,
+    optionally with "events": [{"symbol": ..., "trigger": ..., "detail": ...}].
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        timeout: float = HTTP_TIMEOUT,
+        max_batch_size: int = HTTP_MAX_BATCH_SIZE
+    ):
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.max_batch_size = max_batch_size
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive
+            )
+        )
+
+    async def _fetch_batch(self, tickers: Sequence[str]) -> Dict[str, Quote]:
+        response = await self._client.get("/quotes", params={"symbols": ",".join(tickers)})
+        response.raise_for_status()
+        payload = response.json()
+
+        if self.events is not None:
+            for item in payload.get("events", []):
+                if item.get("trigger") in REFRESH_TRIGGERS:
+                    self.events.publish(item["symbol"], item["trigger"], item.get("detail"))
+
+        quotes = (Quote.from_dict(item) for item in payload.get("quotes", []))
+        return {quote.symbol: quote for quote in quotes}
+
+    async def get_quotes(self, tickers: Sequence[str]) -> Dict[str, Quote]:
+        batches = [
+            tickers[i:i + self.max_batch_size]
+            for i in range(0, len(tickers), self.max_batch_size)
+        ]
+        result = {}
+        for quotes in await asyncio.gather(*(self._fetch_batch(b) for b in batches)):
+            result.update(quotes)
+        return result
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_market_data_provider(seed: Optional[int] = None) -> MarketDataProvider:
+    """Build the provider selected by MARKET_DATA_PROVIDER (synthetic | replay | http)"""
+    kind = os.getenv("MARKET_DATA_PROVIDER", "synthetic").lower()
+
+    if kind == "replay":
+        return ReplayMarketDataProvider(os.environ["MARKET_DATA_REPLAY_FILE"])
+    if kind == "http":
+        return HTTPMarketDataProvider(
+            os.environ["MARKET_DATA_URL"],
+            api_key=os.getenv("MARKET_DATA_API_KEY")
+        )
+    if kind != "synthetic":
+        raise ValueError(f"Unknown MARKET_DATA_PROVIDER: {kind}")
+    return SyntheticMarketDataProvider(seed)
+
+
+async def record_quotes(
+    provider: MarketDataProvider,
+    tickers: Sequence[str],
+    path: str,
+    samples: int = 100,
+    interval: float = 1.0
+):
+    """Capture quotes from any provider into a replay file"""
+    with open(path, "a") as f:
+        for i in range(samples):
+            quotes = await provider.get_quotes(list(tickers))
+            for quote in quotes.values():
+                f.write(json.dumps(asdict(quote)) + "\n")
+            if i < samples - 1:
+                await asyncio.sleep(interval)
+
+# ===== QUOTE SERVICE =====
+
+class QuoteService:
+    """
+    Per-symbol quote cache in front of a provider.
+    Concurrent requests arriving within COALESCE_WINDOW are merged into one
+    batched get_quotes call, and a symbol already being fetched is awaited
+    rather than requested twice. Listeners are called with every quote whose
+    timestamp differs from the last one seen for its symbol, and a price move
+    beyond volatility_threshold publishes a volatility_spike event.
+    """
+
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        ttl: float = QUOTE_TTL,
+        maxsize: int = QUOTE_CACHE_SIZE,
+        coalesce_window: float = COALESCE_WINDOW,
+        events: Optional[TriggerEventBus] = None,
+        volatility_threshold: float = VOLATILITY_SPIKE_THRESHOLD
+    ):
+        self.provider = provider
+        self.coalesce_window = coalesce_window
+        self.events = events
+        self.volatility_threshold = volatility_threshold
+        if events is not None:
+            provider.events = events
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_timestamp: Dict[str, float] = {}
+        self._last_price: Dict[str, float] = {}
+        self.listeners: List[Callable[[Quote], None]] = []
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.provider_calls = 0
+
+    async def get_quote(self, ticker: str) -> Quote:
+        return (await self.get_quotes([ticker]))[ticker]
+
+    async def get_quotes(self, tickers: Iterable[str]) -> Dict[str, Quote]:
+        loop = asyncio.get_running_loop()
+        result = {}
+        waiting = {}
+
+        for ticker in dict.fromkeys(tickers):
+            quote = self._cache.get(ticker)
+            if quote is not None:
+                self.hits += 1
+                result[ticker] = quote
+                continue
+
+            self.misses += 1
+            future = self._inflight.get(ticker)
+            if future is None:
+                future = loop.create_future()
+                self._inflight[ticker] = future
+                self._pending.append(ticker)
+            else:
+                self.coalesced += 1
+            waiting[ticker] = future
+
+        if self._pending and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+
+        for ticker, future in waiting.items():
+            # Shield so one cancelled caller doesn't fail everyone sharing the fetch
+            result[ticker] = await asyncio.shield(future)
+
+        return result
+
+    async def _flush(self):
+        await asyncio.sleep(self.coalesce_window)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+        self.provider_calls += 1
+
+        try:
+            quotes = await self.provider.get_quotes(batch)
+        except Exception as e:
+            logger.error(f"❌ Quote fetch failed for {len(batch)} symbols: {e}")
+            for ticker in batch:
+                self._inflight.pop(ticker).set_exception(e)
+            return
+
+        fresh = []
+        for ticker in batch:
+            future = self._inflight.pop(ticker)
+            quote = quotes.get(ticker)
+            if quote is None:
+                future.set_exception(KeyError(f"No market data for {ticker}"))
+            else:
+                self._cache[ticker] = quote
+                future.set_result(quote)
+                if self._last_timestamp.get(ticker) != quote.timestamp:
+                    self._last_timestamp[ticker] = quote.timestamp
+                    fresh.append(quote)
+
+        # Every future is resolved above; a failing listener or event
+        # subscriber is logged and must not stop the others
+        for quote in fresh:
+            for listener in self.listeners:
+                try:
+                    listener(quote)
+                except Exception as e:
+                    logger.error(f"❌ Quote listener failed for {quote.symbol}: {e}")
+            try:
+                self._check_volatility(quote)
+            except Exception as e:
+                logger.error(f"❌ Volatility check failed for {quote.symbol}: {e}")
+
+    def _check_volatility(self, quote: Quote):
+        previous = self._last_price.get(quote.symbol)
+        self._last_price[quote.symbol] = quote.price
+        if self.events is None or not previous or self.volatility_threshold <= 0:
+            return
+
+        move = abs(quote.price / previous - 1.0)
+        if move > self.volatility_threshold:
+            self.events.publish(quote.symbol, "volatility_spike", f"{move:.1%} move", quote.timestamp)
+
+    def invalidate(self, symbol: str, before: float):
+        """Drop cached quotes older than an event so the next request refetches"""
+        symbols = list(self._cache.keys()) if symbol == MARKET_WIDE else [symbol]
+        for ticker in symbols:
+            quote = self._cache.get(ticker)
+            if quote is not None and quote.timestamp < before:
+                self._cache.pop(ticker, None)
+
+    def stats(self) -> Dict:
+        return {
+            "cached_symbols": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "provider_calls": self.provider_calls
+        }
+
+    async def close(self):
+        await self.provider.close()
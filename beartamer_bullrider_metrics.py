@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+BearTamer / BullRider - Metrics and Profiling
+Copyright (c) 2025 Joshua Hendricks Cole (DBA: Corporation of Light). All Rights Reserved. PATENT PENDING.
+
+Dependency-free instrumentation for the prediction API:
+- Counter / Histogram: labelled metrics rendered in Prometheus text format
+- MetricsRegistry: owns the metrics plus collectors that read live stats() dicts
+- Histogram.time(): context manager that records elapsed seconds
+- profile_awaitable: per-request profile (pyinstrument when installed, else cProfile)
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, Sequence, Tuple
+
+try:
+    from pyinstrument import Profiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+# Seconds; the layers run in tens of microseconds, full requests in milliseconds
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+PROFILE_TOP_FUNCTIONS = 30  # rows in the cProfile summary
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]  # (metric suffix, labels, value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+# ===== METRICS =====
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name if name.endswith("_total") else f"{name}_total"
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [
+                ("", dict(zip(self.labelnames, key)), value)
+                for key, value in self._values.items()
+            ]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with optional labels. Observations are O(log buckets)
+    and thread-safe, so layers running in the thread pool can record directly.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}  # per-bucket, last slot is +Inf
+        self._sums: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Record the elapsed wall time of the with-block, even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+                samples.append(("_sum", labels, self._sums[key]))
+                samples.append(("_count", labels, cumulative))
+        return samples
+
+# ===== REGISTRY =====
+
+Collector = Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+class MetricsRegistry:
+    """
+    Metrics owned by the process plus collectors, which report values other
+    components already count (cache hits, pool depth) at scrape time rather
+    than duplicating the bookkeeping. A collector returns
+    [(name, type, help, [(labels, value), ...]), ...].
+    """
+
+    def __init__(self):
+        self.metrics: List = []
+        self.collectors: List[Collector] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+        for collector in self.collectors:
+            for name, kind, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+# ===== PROFILING =====
+
+async def profile_awaitable(awaitable: Awaitable, top: int = PROFILE_TOP_FUNCTIONS) -> Tuple[object, str]:
+    """
+    Await under a profiler and return (result, text summary). pyinstrument's
+    async mode attributes time to the awaiting coroutine; the cProfile fallback
+    sees everything on the event-loop thread while the request runs, but not
+    work dispatched to the layer thread/process pools.
+    """
+    if PYINSTRUMENT_AVAILABLE:
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            result = await awaitable
+        finally:
+            profiler.stop()
+        return result, profiler.output_text(unicode=False, color=False)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = await awaitable
+    finally:
+        profiler.disable()
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(top)
+    return result, output.getvalue()
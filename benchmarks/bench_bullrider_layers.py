@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+BullRider Layer Microbenchmarks
+Copyright (c) 2025 Joshua Hendricks Cole (DBA: Corporation of Light). All Rights Reserved. PATENT PENDING.
+
+pytest-benchmark timings for each SevenLayerPredictor._layer_* method and
+_assemble_prediction. Layers run through LayerExecutor in BENCH_LAYER_MODE
+(default "inline", so the numbers are the layer math plus coroutine overhead;
+"thread" adds the pool hand-off). Memoization is bypassed: every round calls
+the layer method directly.
+
+Usage:
+    pytest benchmarks/bench_bullrider_layers.py --benchmark-sort=mean
+    BENCH_LAYER_MODE=thread pytest benchmarks/bench_bullrider_layers.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+logging.disable(logging.INFO)
+
+import beartamer_bullrider_backend as backend  # noqa: E402
+
+LAYER_MODE = os.getenv("BENCH_LAYER_MODE", "inline")
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def predictor(loop):
+    executor = backend.LayerExecutor(modes=dict.fromkeys(backend.LAYER_NAMES, LAYER_MODE))
+    predictor = backend.SevenLayerPredictor(executor=executor)
+    yield predictor
+    executor.shutdown()
+    loop.run_until_complete(predictor.quotes.close())
+
+
+@pytest.fixture(scope="module")
+def inputs(loop, predictor):
+    """One set of upstream layer outputs shared by every benchmark"""
+    request = backend.PredictionRequest(ticker="AAPL", horizon=7)
+    layers = {}
+    result = loop.run_until_complete(
+        predictor.predict(request, refresh=True, on_layer=layers.__setitem__)
+    )
+    quote = loop.run_until_complete(predictor.quotes.get_quote("AAPL"))
+    return {"request": request, "quote": quote, "result": result, **layers}
+
+
+def test_layer_1_crystalline_intent(benchmark, loop, predictor, inputs):
+    benchmark(lambda: loop.run_until_complete(
+        predictor._layer_1_crystalline_intent(inputs["request"])
+    ))
+
+
+def test_layer_2_echo_prime(benchmark, loop, predictor, inputs):
+    rng = np.random.default_rng(0)
+    benchmark(lambda: loop.run_until_complete(
+        predictor._layer_2_echo_prime(inputs["request"], inputs["crystalline_intent"], rng)
+    ))
+
+
+def test_layer_3_parallel_pathways(benchmark, loop, predictor, inputs):
+    benchmark(lambda: loop.run_until_complete(
+        predictor._layer_3_parallel_pathways(inputs["echo_prime"])
+    ))
+
+
+def test_layer_4_echo_resonance(benchmark, loop, predictor, inputs):
+    benchmark(lambda: loop.run_until_complete(
+        predictor._layer_4_echo_resonance(inputs["parallel_pathways"], inputs["echo_prime"])
+    ))
+
+
+def test_layer_5_real_time_data(benchmark, loop, predictor, inputs):
+    benchmark(lambda: loop.run_until_complete(
+        predictor._layer_5_real_time_data(inputs["request"], inputs["quote"])
+    ))
+
+
+def test_layer_6_echo_vision(benchmark, loop, predictor, inputs):
+    benchmark(lambda: loop.run_until_complete(predictor._layer_6_echo_vision(
+        inputs["crystalline_intent"], inputs["echo_prime"], inputs["parallel_pathways"],
+        inputs["echo_resonance"], inputs["real_time_data"]
+    )))
+
+
+def test_layer_7_temporal_anchoring(benchmark, loop, predictor, inputs):
+    benchmark(lambda: loop.run_until_complete(
+        predictor._layer_7_temporal_anchoring(inputs["request"], inputs["echo_vision"])
+    ))
+
+
+def test_assemble_prediction(benchmark, loop, predictor, inputs):
+    benchmark(lambda: loop.run_until_complete(predictor._assemble_prediction(
+        inputs["request"], *(inputs[name] for name in backend.LAYER_NAMES)
+    )))
+
+
+def test_asdict_prediction(benchmark, inputs):
+    benchmark(backend.asdict, inputs["result"])
+
+
+def test_predict_cold(benchmark, loop, predictor, inputs):
+    """Full pipeline with every cache bypassed (memos cleared each round)"""
+    def run():
+        predictor.layer_memo.invalidate(backend.MARKET_WIDE)
+        return loop.run_until_complete(predictor.predict(inputs["request"], refresh=True))
+    benchmark(run)
+
+
+def test_predict_cached(benchmark, loop, predictor, inputs):
+    loop.run_until_complete(predictor.predict(inputs["request"]))
+    benchmark(lambda: loop.run_until_complete(predictor.predict(inputs["request"])))
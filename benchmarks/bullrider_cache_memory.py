@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+BullRider Prediction Cache - Memory Benchmark
+Copyright (c) 2025 Joshua Hendricks Cole (DBA: Corporation of Light). All Rights Reserved. PATENT PENDING.
+
+Fills a SevenLayerPredictor cache with distinct predictions and reports the
+bytes each cached PredictionResult costs, measured two ways:
+- tracemalloc: heap freed when every cache entry is evicted, after the rest of
+  the predictor (layer memos, quote cache, histograms) has been released, so
+  only what the prediction cache alone keeps alive is counted: the result,
+  its request, the entry record and the key
+- deep size: recursive sys.getsizeof over the result graph (__dict__ and __slots__)
+
+Usage:
+    python benchmarks/bullrider_cache_memory.py [--predictions 1000]
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+logging.disable(logging.INFO)
+
+import beartamer_bullrider_backend as backend  # noqa: E402
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """Recursive size of an object graph, following __dict__, __slots__ and containers"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+async def fill_cache(predictor, count: int):
+    for i in range(count):
+        await predictor.predict(backend.PredictionRequest(ticker=f"T{i:04d}"))
+
+
+def run(count: int) -> dict:
+    backend.MAX_CACHE_SIZE = max(backend.MAX_CACHE_SIZE, count)
+    predictor = backend.SevenLayerPredictor()
+
+    # Warm up interpreter-level caches so they don't count against the results
+    asyncio.run(fill_cache(backend.SevenLayerPredictor(), 10))
+
+    gc.collect()
+    tracemalloc.start()
+    asyncio.run(fill_cache(predictor, count))
+
+    # Keep only the cache; the events bus would keep the predictor alive through its subscriptions
+    cache = predictor.cache
+    cache.events = None
+    del predictor
+    gc.collect()
+
+    results = cache.values()
+    seen = set()
+    # Strings shared by every result (enum members, trigger names) are counted once
+    deep_total = sum(deep_sizeof(r, seen) for r in results)
+    del results
+
+    filled, _ = tracemalloc.get_traced_memory()
+    entries = len(cache)
+    cache.invalidate(backend.MARKET_WIDE)
+    gc.collect()
+    emptied, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "predictions": entries,
+        "traced_bytes_per_prediction": (filled - emptied) / entries,
+        "deep_bytes_per_prediction": deep_total / entries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BullRider cache memory benchmark")
+    parser.add_argument("--predictions", type=int, default=backend.MAX_CACHE_SIZE)
+    args = parser.parse_args()
+
+    stats = run(args.predictions)
+
+    print("=" * 60)
+    print("BULLRIDER CACHE MEMORY BENCHMARK")
+    print("=" * 60)
+    print(f"Cached predictions:        {stats['predictions']}")
+    print(f"tracemalloc bytes/entry:   {stats['traced_bytes_per_prediction']:,.0f}")
+    print(f"Deep-size bytes/entry:     {stats['deep_bytes_per_prediction']:,.0f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+BullRider API - In-Process Load Test
+Copyright (c) 2025 Joshua Hendricks Cole (DBA: Corporation of Light). All Rights Reserved. PATENT PENDING.
+
+Drives the FastAPI app in-process (no sockets, no uvicorn) so results measure
+the service itself:
+- /predict and /layers through httpx.AsyncClient + httpx.ASGITransport
+- /ws/predict through a minimal ASGI websocket client (one connection per worker)
+
+Each scenario gets a fresh SevenLayerPredictor (cold caches) and reports
+req/s, latency percentiles, prediction-cache hit ratio and memory for every
+combination of endpoint x concurrency x ticker cardinality. Tickers are drawn
+uniformly or Zipf-distributed (a few hot names, a long tail). Admission limits
+are off unless --admission is given, in which case 429/503 responses and
+rate-limited websocket messages are reported as rejected.
+
+Usage:
+    python benchmarks/bullrider_load_test.py
+    python benchmarks/bullrider_load_test.py --endpoints predict,ws --concurrency 1,16,64 \\
+        --tickers 10,1000 --distribution zipf --requests 2000 --json results.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+logging.disable(logging.INFO)
+
+import beartamer_bullrider_backend as backend  # noqa: E402
+
+ENDPOINTS = ("predict", "layers", "ws")
+ZIPF_EXPONENT = 1.1
+
+# ===== WEBSOCKET CLIENT =====
+
+class ASGIWebSocket:
+    """Just enough of the ASGI websocket protocol to talk to an app in-process"""
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue()
+        self._task = None
+
+    async def connect(self) -> "ASGIWebSocket":
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+            "subprotocols": []
+        }
+        self._task = asyncio.create_task(self.app(scope, self._to_app.get, self._from_app.put))
+        await self._to_app.put({"type": "websocket.connect"})
+        message = await self._from_app.get()
+        if message["type"] != "websocket.accept":
+            raise ConnectionError(f"WebSocket rejected: {message}")
+        return self
+
+    async def send_json(self, data: Dict):
+        await self._to_app.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive_json(self) -> Dict:
+        message = await self._from_app.get()
+        if message["type"] == "websocket.close":
+            raise ConnectionError(f"WebSocket closed: {message.get('code')}")
+        return json.loads(message.get("text") or message["bytes"])
+
+    async def close(self):
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    async def __aenter__(self) -> "ASGIWebSocket":
+        return await self.connect()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+# ===== TICKER PROFILES =====
+
+def ticker_sampler(cardinality: int, distribution: str, seed: int) -> Callable[[], str]:
+    tickers = [f"T{i:05d}" for i in range(cardinality)]
+    rng = np.random.default_rng(seed)
+    if distribution == "zipf":
+        weights = 1.0 / np.arange(1, cardinality + 1) ** ZIPF_EXPONENT
+        p = weights / weights.sum()
+    else:
+        p = None
+    return lambda: tickers[rng.choice(cardinality, p=p)]
+
+# ===== WORKERS =====
+
+async def http_worker(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    next_ticker,
+    remaining: List[int],
+    latencies: List[float],
+    rejected: List[int]
+):
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        ticker = next_ticker()
+        start = time.perf_counter()
+        if endpoint == "predict":
+            response = await client.post("/predict", json={"ticker": ticker})
+        else:
+            response = await client.get(f"/layers/{ticker}")
+        if response.status_code in (429, 503):
+            rejected[0] += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+async def ws_worker(next_ticker, remaining: List[int], latencies: List[float], rejected: List[int]):
+    # /ws/predict binds a ticker per connection, so reconnect when the ticker changes
+    ticker = next_ticker()
+    while remaining[0] > 0:
+        ws = ASGIWebSocket(backend.app, f"/ws/predict/{ticker}")
+        try:
+            await ws.connect()
+        except ConnectionError:
+            # Connection refused by admission control counts as one rejected request
+            await ws.close()
+            remaining[0] -= 1
+            rejected[0] += 1
+            ticker = next_ticker()
+            continue
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                start = time.perf_counter()
+                await ws.send_json({"horizon": 7})
+                if "error" in await ws.receive_json():
+                    rejected[0] += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+                following = next_ticker()
+                if following != ticker:
+                    ticker = following
+                    break
+        finally:
+            await ws.close()
+
+# ===== SCENARIOS =====
+
+def rss_mb() -> float:
+    """Current resident set size (falls back to peak where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_scenario(endpoint: str, concurrency: int, cardinality: int, args) -> Dict:
+    # Fresh predictor: every scenario starts with cold caches
+    backend.predictor.executor.shutdown()
+    backend.predictor = backend.SevenLayerPredictor()
+    backend.PREDICTION_UPDATE_INTERVAL = args.ws_interval
+    if args.admission:
+        backend.admission = backend.AdmissionController()
+    else:
+        backend.admission = backend.AdmissionController(
+            max_in_flight=0, client_rate=0, api_key_rate=0, ws_message_rate=0
+        )
+
+    next_ticker = ticker_sampler(cardinality, args.distribution, args.seed)
+    remaining = [args.requests]
+    latencies: List[float] = []
+    rejected = [0]
+
+    gc.collect()
+    rss_before = rss_mb()
+    if args.tracemalloc:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    if endpoint == "ws":
+        await asyncio.gather(*(
+            ws_worker(next_ticker, remaining, latencies, rejected) for _ in range(concurrency)
+        ))
+    else:
+        transport = httpx.ASGITransport(app=backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await asyncio.gather(*(
+                http_worker(client, endpoint, next_ticker, remaining, latencies, rejected)
+                for _ in range(concurrency)
+            ))
+
+    elapsed = time.perf_counter() - start
+    traced_peak = None
+    if args.tracemalloc:
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    cache = backend.predictor.cache.stats()
+    lookups = cache["hits"] + cache["misses"]
+    ms = np.asarray(latencies) * 1000
+    await backend.predictor.quotes.close()
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "tickers": cardinality,
+        "distribution": args.distribution,
+        "requests": len(latencies),
+        "rejected": rejected[0],
+        "req_per_s": len(latencies) / elapsed,
+        **{
+            f"p{q}_ms": float(np.percentile(ms, q)) if len(ms) else 0.0
+            for q in (50, 90, 99)
+        },
+        "max_ms": float(ms.max()) if len(ms) else 0.0,
+        "cache_hit_ratio": cache["hits"] / lookups if lookups else 0.0,
+        "cached_predictions": cache["size"],
+        "rss_mb": rss_mb(),
+        "rss_growth_mb": rss_mb() - rss_before,
+        "traced_peak_mb": traced_peak / 2**20 if traced_peak is not None else None
+    }
+
+
+def print_table(results: List[Dict]):
+    header = (
+        f"{'endpoint':9} {'conc':>5} {'tickers':>8} {'req/s':>9} {'p50 ms':>8} "
+        f"{'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'hit %':>6} {'reject':>6} {'RSS MB':>8} {'+MB':>6}"
+    )
+    print("=" * len(header))
+    print("BULLRIDER LOAD TEST")
+    print("=" * len(header))
+    print(header)
+    for r in results:
+        print(
+            f"{r['endpoint']:9} {r['concurrency']:>5} {r['tickers']:>8} {r['req_per_s']:>9,.0f} "
+            f"{r['p50_ms']:>8.2f} {r['p90_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['max_ms']:>8.2f} "
+            f"{r['cache_hit_ratio'] * 100:>6.1f} {r['rejected']:>6} {r['rss_mb']:>8.1f} {r['rss_growth_mb']:>6.1f}"
+        )
+    print("=" * len(header))
+
+
+def int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BullRider in-process load test")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="comma-separated: predict,layers,ws")
+    parser.add_argument("--concurrency", type=int_list, default=[1, 16, 64])
+    parser.add_argument("--tickers", type=int_list, default=[10, 1000], help="ticker cardinalities")
+    parser.add_argument("--distribution", choices=("uniform", "zipf"), default="zipf")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--ws-interval", type=float, default=0.0,
+                        help="server-side pause between websocket updates (production: 2.0)")
+    parser.add_argument("--admission", action="store_true",
+                        help="keep the production admission limits and count rejections")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report traced peak (slower)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    endpoints = args.endpoints.split(",")
+    for endpoint in endpoints:
+        if endpoint not in ENDPOINTS:
+            parser.error(f"unknown endpoint {endpoint}")
+
+    results = []
+    for endpoint in endpoints:
+        for cardinality in args.tickers:
+            for concurrency in args.concurrency:
+                results.append(asyncio.run(run_scenario(endpoint, concurrency, cardinality, args)))
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Historical Bar Store - Memory-Mapped Columnar OHLCV Storage
+Copyright (c) 2025 Joshua Hendricks Cole (DBA: Corporation of Light). All Rights Reserved. PATENT PENDING.
+
+Local time-series store for the quantum predictors and backtester.
+Each symbol is a directory of raw little-endian column files:
+
+    <root>/<SYMBOL>/timestamp.i8   epoch seconds, strictly increasing
+    <root>/<SYMBOL>/open.f8 ... volume.f8
+    <root>/<SYMBOL>/meta.json      committed row count
+
+Columns are appended in place and read back through np.memmap, so a
+multi-year history loads without parsing and range lookups are a binary
+search over the timestamp column. Slices returned by range()/closes() are
+zero-copy views that can be passed straight to QuantumTimeSeriesPredictor.predict.
+"""
+
+import argparse
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+COLUMN_DTYPES = {
+    "timestamp": np.dtype("<i8"),
+    **{name: np.dtype("<f8") for name in PRICE_COLUMNS}
+}
+COLUMN_FILES = {
+    name: f"{name}.{dtype.kind}{dtype.itemsize}" for name, dtype in COLUMN_DTYPES.items()
+}
+MAX_OPEN_SYMBOLS = 1024  # memory-mapped symbols kept open at once
+BAR_STORE_ENV = "BULLRIDER_BAR_STORE"  # store root shared by the backend and the backtester
+
+TimeLike = Union[int, float, datetime, np.datetime64, str]
+
+
+def to_epoch_seconds(value: TimeLike) -> int:
+    """Convert a timestamp-like value to integer epoch seconds"""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, (str, np.datetime64)):
+        return int(np.datetime64(value, "s").astype(np.int64))
+    return int(value)
+
+
+@dataclass(slots=True)
+class BarSlice:
+    """Zero-copy view over a contiguous run of bars for one symbol"""
+    symbol: str
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+
+class HistoricalBarStore:
+    """Append-only, memory-mapped OHLCV store keyed by symbol"""
+
+    def __init__(self, root: str, max_open_symbols: int = MAX_OPEN_SYMBOLS):
+        self.root = root
+        self.max_open_symbols = max_open_symbols
+        self._open: "OrderedDict[str, tuple]" = OrderedDict()  # symbol -> (meta signature, columns)
+        os.makedirs(root, exist_ok=True)
+
+    # ===== METADATA =====
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol.upper())
+
+    def symbols(self) -> List[str]:
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, "meta.json"))
+        )
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.count(symbol) > 0
+
+    def count(self, symbol: str) -> int:
+        """Committed number of bars for a symbol"""
+        try:
+            with open(os.path.join(self._symbol_dir(symbol), "meta.json")) as f:
+                return int(json.load(f)["count"])
+        except FileNotFoundError:
+            return 0
+
+    def _write_count(self, symbol: str, count: int):
+        path = os.path.join(self._symbol_dir(symbol), "meta.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"count": count}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)  # readers only ever see whole appends
+
+    def last_timestamp(self, symbol: str) -> Optional[int]:
+        columns = self._columns(symbol)
+        if len(columns["timestamp"]) == 0:
+            return None
+        return int(columns["timestamp"][-1])
+
+    # ===== INGESTION =====
+
+    def append(
+        self,
+        symbol: str,
+        timestamps: np.ndarray,
+        opens: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray
+    ) -> int:
+        """
+        Append bars for a symbol. Timestamps must be strictly increasing and
+        newer than anything already stored. Returns the number of bars written.
+        """
+        timestamps = np.asarray(timestamps)
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype("datetime64[s]")
+        timestamps = timestamps.astype(COLUMN_DTYPES["timestamp"])
+
+        values = {"timestamp": timestamps}
+        for name, column in zip(PRICE_COLUMNS, (opens, highs, lows, closes, volumes)):
+            values[name] = np.asarray(column, dtype=COLUMN_DTYPES[name])
+            if values[name].shape != timestamps.shape:
+                raise ValueError(f"Column '{name}' length does not match timestamps")
+
+        if len(timestamps) == 0:
+            return 0
+        if np.any(np.diff(timestamps) <= 0):
+            raise ValueError("Timestamps must be strictly increasing")
+        last = self.last_timestamp(symbol)
+        if last is not None and timestamps[0] <= last:
+            raise ValueError(f"{symbol}: bars must be newer than {last}")
+
+        directory = self._symbol_dir(symbol)
+        os.makedirs(directory, exist_ok=True)
+        count = self.count(symbol)
+        self._open.pop(symbol.upper(), None)
+
+        for name, dtype in COLUMN_DTYPES.items():
+            path = os.path.join(directory, COLUMN_FILES[name])
+            with open(path, "ab") as f:
+                # Drop bytes left over from an append that never committed
+                f.truncate(count * dtype.itemsize)
+                values[name].tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._write_count(symbol, count + len(timestamps))
+        return len(timestamps)
+
+    # ===== READS =====
+
+    def _meta_signature(self, symbol: str) -> Optional[tuple]:
+        """Identity of the committed meta.json; each commit os.replace()s a new file"""
+        try:
+            stat = os.stat(os.path.join(self._symbol_dir(symbol), "meta.json"))
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _columns(self, symbol: str) -> Dict[str, np.ndarray]:
+        # Re-stat meta.json on every read so appends from other processes
+        # (the ingest CLI, another store instance) become visible
+        key = symbol.upper()
+        signature = self._meta_signature(symbol)
+        cached = self._open.get(key)
+        if cached is not None and cached[0] == signature:
+            self._open.move_to_end(key)
+            return cached[1]
+
+        count = self.count(symbol)
+        directory = self._symbol_dir(symbol)
+        columns = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            if count == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(
+                    os.path.join(directory, COLUMN_FILES[name]),
+                    dtype=dtype, mode="r", shape=(count,)
+                ).view(np.ndarray)
+
+        self._open[key] = (signature, columns)
+        if len(self._open) > self.max_open_symbols:
+            self._open.popitem(last=False)
+        return columns
+
+    def range(
+        self,
+        symbol: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None
+    ) -> BarSlice:
+        """Bars with start <= timestamp < end, located by binary search"""
+        columns = self._columns(symbol)
+        timestamps = columns["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, to_epoch_seconds(start), "left"))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, to_epoch_seconds(end), "left"))
+        return BarSlice(symbol.upper(), **{name: col[lo:hi] for name, col in columns.items()})
+
+    def tail(self, symbol: str, n: int) -> BarSlice:
+        """Most recent n bars"""
+        columns = self._columns(symbol)
+        return BarSlice(symbol.upper(), **{name: col[-n:] if n else col[:0] for name, col in columns.items()})
+
+    def closes(
+        self,
+        symbol: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None
+    ) -> np.ndarray:
+        """Close prices as a zero-copy view, ready for QuantumTimeSeriesPredictor.predict"""
+        return self.range(symbol, start, end).close
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historical bar store utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="Append bars from a CSV file")
+    ingest.add_argument("root", help="Store directory")
+    ingest.add_argument("symbol")
+    ingest.add_argument("csv", help="CSV with header timestamp,open,high,low,close,volume")
+
+    info = subparsers.add_parser("info", help="Show stored symbols and bar counts")
+    info.add_argument("root", help="Store directory")
+
+    args = parser.parse_args()
+    store = HistoricalBarStore(args.root)
+
+    if args.command == "ingest":
+        rows = np.loadtxt(args.csv, delimiter=",", skiprows=1, ndmin=2)
+        written = store.append(args.symbol, rows[:, 0].astype(np.int64), *rows[:, 1:6].T)
+        print(f"Appended {written} bars to {args.symbol.upper()} ({store.count(args.symbol)} total)")
+    else:
+        for symbol in store.symbols():
+            print(f"{symbol:10} {store.count(symbol):>10} bars  last={store.last_timestamp(symbol)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,20 @@ Validates accuracy, provides performance metrics, and generates reports.
 
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import json
+import os
+
+from beartamer_bullrider_market_data import symbol_seed_sequence
+from historical_bar_store import BAR_STORE_ENV, HistoricalBarStore
+
+DATA_SEED = 2025  # root entropy for generated histories
+
+
+def ticker_seed(ticker: str) -> np.random.SeedSequence:
+    """Per-ticker SeedSequence, derived the same way as the synthetic market feed's"""
+    return symbol_seed_sequence(DATA_SEED, ticker)
 
 
 @dataclass
@@ -44,9 +55,9 @@ class HistoricalDataGenerator:
         Generate realistic stock price data using geometric Brownian motion.
         Resembles actual market behavior with trends, reversions, and volatility clustering.
         """
-        np.random.seed(hash(ticker) % 2**32)  # Consistent seed per ticker
+        rng = np.random.default_rng(ticker_seed(ticker))  # Consistent stream per ticker
 
-        returns = np.random.normal(0.0005, 0.015, days)  # Daily returns: 0.05% mean, 1.5% std
+        returns = rng.normal(0.0005, 0.015, days)  # Daily returns: 0.05% mean, 1.5% std
         prices = initial_price * np.exp(np.cumsum(returns))
 
         # Add trend
@@ -65,23 +76,17 @@ class HistoricalDataGenerator:
         Generate cryptocurrency price data with higher volatility and regime changes.
         Models crypto-specific behaviors: rapid trends, crashes, recoveries.
         """
-        np.random.seed(hash(ticker) % 2**32)
+        rng = np.random.default_rng(ticker_seed(ticker))
 
-        prices = [initial_price]
-        for i in range(days - 1):
-            # Regime changes every 50-100 days
-            regime = int(i / 75) % 3
-            if regime == 0:  # Bull market
-                daily_return = np.random.normal(0.002, 0.03)
-            elif regime == 1:  # Bear market
-                daily_return = np.random.normal(-0.001, 0.035)
-            else:  # Volatile sideways
-                daily_return = np.random.normal(0, 0.04)
+        # Regime changes every 75 days: bull, bear, volatile sideways
+        regime = (np.arange(days - 1) // 75) % 3
+        regime_mean = np.array([0.002, -0.001, 0.0])
+        regime_std = np.array([0.03, 0.035, 0.04])
+        daily_returns = rng.normal(regime_mean[regime], regime_std[regime])
 
-            new_price = prices[-1] * (1 + daily_return)
-            prices.append(max(new_price, prices[-1] * 0.7))  # Prevent crashes below 70%
-
-        return np.array(prices)
+        # Prevent single-day crashes below 70%
+        growth = np.maximum(1 + daily_returns, 0.7)
+        return initial_price * np.concatenate([[1.0], np.cumprod(growth)])
 
     @staticmethod
     def split_into_windows(prices: np.ndarray, train_size: int = 300, test_size: int = 150) -> Tuple:
@@ -95,11 +100,18 @@ class HistoricalDataGenerator:
 class QuantumPredictionBacktester:
     """Backtest quantum predictions against historical data"""
 
-    def __init__(self, framework_module):
-        """Initialize with quantum prediction framework"""
+    def __init__(self, framework_module, bar_store: Optional[HistoricalBarStore] = None):
+        """Initialize with quantum prediction framework and an optional stored price history"""
         self.framework = framework_module
+        self.bar_store = bar_store
         self.results = []
 
+    def _load_prices(self, ticker: str, generator) -> np.ndarray:
+        """Stored close prices (zero-copy memmap view) when available, else generated data"""
+        if self.bar_store is not None and ticker in self.bar_store:
+            return self.bar_store.closes(ticker)
+        return generator(ticker, days=500)
+
     def test_stock_prediction(self, ticker: str, horizon: int = 30) -> BacktestResult:
         """
         Backtest stock prediction on historical data.
@@ -115,23 +127,26 @@ class QuantumPredictionBacktester:
         print(f"Testing {ticker} - {horizon} day horizon")
         print(f"{'='*60}")
 
-        # Generate historical data
-        prices = HistoricalDataGenerator.generate_stock_data(ticker, days=500)
+        # Load stored history, or generate it
+        prices = self._load_prices(ticker, HistoricalDataGenerator.generate_stock_data)
         train, val, test = HistoricalDataGenerator.split_into_windows(
             prices, train_size=300, test_size=100
         )
 
         # Train on historical data
-        predictor = self.framework.QuantumEnsemblePredictor(num_ensemble_members=3)
+        predictor = self.framework.QuantumEnsemblePredictor(
+            num_ensemble_members=3, seed=ticker_seed(ticker)
+        )
 
         # Make predictions on test set using walk-forward validation
         predictions = []
         actuals = []
         confidences = []
 
+        history_start = len(train) + len(val)
         for i in range(horizon, len(test) - horizon):
-            # Use data up to current point
-            hist_window = np.concatenate([train, val, test[:i]])
+            # Use data up to current point (a view, not a copy)
+            hist_window = prices[:history_start + i]
 
             # Make prediction
             pred_result = predictor.predict(hist_window)
@@ -220,19 +235,22 @@ class QuantumPredictionBacktester:
         print(f"Testing {ticker} (Crypto) - {horizon} day horizon")
         print(f"{'='*60}")
 
-        # Generate crypto data (higher volatility)
-        prices = HistoricalDataGenerator.generate_crypto_data(ticker, days=500)
+        # Load stored history, or generate crypto data (higher volatility)
+        prices = self._load_prices(ticker, HistoricalDataGenerator.generate_crypto_data)
         train, val, test = HistoricalDataGenerator.split_into_windows(
             prices, train_size=300, test_size=100
         )
 
-        predictor = self.framework.QuantumEnsemblePredictor(num_ensemble_members=3)
+        predictor = self.framework.QuantumEnsemblePredictor(
+            num_ensemble_members=3, seed=ticker_seed(ticker)
+        )
 
         predictions = []
         actuals = []
 
+        history_start = len(train) + len(val)
         for i in range(horizon, len(test) - horizon):
-            hist_window = np.concatenate([train, val, test[:i]])
+            hist_window = prices[:history_start + i]
             pred_result = predictor.predict(hist_window)
             predictions.append(pred_result.prediction)
 
@@ -360,7 +378,10 @@ def run_comprehensive_backtest():
         print("Error: quantum_prediction_framework not found")
         return
 
-    backtester = QuantumPredictionBacktester(qpf)
+    # Backtest on stored bars when BULLRIDER_BAR_STORE points at a HistoricalBarStore
+    store_path = os.getenv(BAR_STORE_ENV)
+    bar_store = HistoricalBarStore(store_path) if store_path else None
+    backtester = QuantumPredictionBacktester(qpf, bar_store=bar_store)
 
     # Test stocks
     print("\n>>> STOCK MARKET PREDICTIONS")
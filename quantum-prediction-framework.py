@@ -6,13 +6,64 @@ Implements hybrid classical-quantum algorithms for market, weather, legal, and p
 Based on published research: VQE variants, QAOA, and quantum ML from 2023-2025 papers.
 """
 
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import warnings
 import numpy as np
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional, Union
 from abc import ABC, abstractmethod
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor
 import json
 from datetime import datetime, timedelta
 
+SeedLike = Union[None, int, np.random.SeedSequence]
+
+
+def make_seed_sequence(seed: SeedLike = None) -> np.random.SeedSequence:
+    """Root SeedSequence for a component; spawn() children for its sub-components"""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+# ===== PROCESS POOLS =====
+# Process pools pickle functions and classes by module name. This file's name is
+# hyphenated, so whoever loads it via importlib must register it in sys.modules
+# (workers started with "spawn" must also be able to import it under that name).
+# Without that, callers fall back to running in-process.
+
+POOL_ERRORS = (pickle.PicklingError, BrokenExecutor)  # the pool itself failed, not the task
+
+
+class PoolFallbackWarning(RuntimeWarning):
+    """Work meant for a process pool ran in-process instead"""
+
+
+def pool_importable() -> bool:
+    """True if pool workers can unpickle references to this module"""
+    return getattr(sys.modules.get(__name__), "pool_importable", None) is pool_importable
+
+
+def warn_pool_fallback(error: Optional[BaseException] = None):
+    """
+    Warn that pool work is running in-process: the module isn't importable by
+    workers (no error) or one of POOL_ERRORS was raised. The text only names
+    the error type, so the default filters show it once per call site.
+    """
+    reason = type(error).__name__ if error is not None else f"module '{__name__}' is not in sys.modules"
+    warnings.warn(f"Process pool unusable ({reason}); running in-process", PoolFallbackWarning, stacklevel=3)
+
+
+def abandon_pool(futures: List[Future], error: BaseException):
+    """Cancel the rest of a batch after one of POOL_ERRORS, before rerunning it in-process"""
+    for future in futures:
+        future.cancel()
+    warn_pool_fallback(error)
+
 
 @dataclass
 class PredictionResult:
@@ -29,6 +80,288 @@ class PredictionResult:
     warnings: List[str]
 
 
+@dataclass
+class SparseAmplitudes:
+    """
+    Amplitude-encoded state stored as its populated prefix plus the logical
+    2**num_qubits size. Every amplitude past len(values) is zero.
+    """
+    values: np.ndarray
+    size: int
+
+    def __len__(self) -> int:
+        return self.size
+
+    def head(self, n: int) -> np.ndarray:
+        """First n amplitudes (zero-padded only when n exceeds the prefix)"""
+        if n <= len(self.values):
+            return self.values[:n]
+        return np.concatenate([self.values, np.zeros(min(n, self.size) - len(self.values))])
+
+    def dot(self, vector: np.ndarray) -> float:
+        """Inner product with a dense vector over the populated slice only"""
+        k = min(len(self.values), len(vector))
+        return self.values[:k] @ vector[:k]
+
+    def dense(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        out = np.empty(self.size, dtype=self.values.dtype) if out is None else out
+        out[:len(self.values)] = self.values
+        out[len(self.values):] = 0
+        return out
+
+
+def rx_matrix(theta: float) -> np.ndarray:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]])
+
+
+def ry_matrix(theta: float) -> np.ndarray:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def rz_matrix(theta: float) -> np.ndarray:
+    return np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+
+
+HADAMARD = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+PAULI_X = np.array([[0, 1], [1, 0]], dtype=complex)
+CNOT = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+CZ = np.diag([1, 1, 1, -1]).astype(complex)
+GRAM_TILE_SIZE = 2048      # rows/columns per Gram-matrix tile
+ENCODING_CACHE_SIZE = 8    # encoded datasets kept per QuantumMLEncoder
+MATMUL_MIN_STRIDE = 64  # below this, single-qubit gates use elementwise passes instead of matmul
+
+# SPSA gain schedules (Spall 1998): a_k = a * ((1 + A) / (k + 1 + A))**alpha, c_k = c / (k + 1)**gamma
+SPSA_PERTURBATION = 0.1    # c
+SPSA_ALPHA = 0.602
+SPSA_GAMMA = 0.101
+SPSA_STABILITY = 10.0      # A
+
+# QUBO annealing (QuantumAnnealingOptimizer.anneal)
+ANNEAL_SWEEPS = 200        # full passes over every bit
+ANNEAL_CHAINS = 64         # independent chains / tempering replicas, advanced together as arrays
+
+
+class StatevectorSimulator:
+    """
+    Dense statevector simulator backing the quantum classes in this module.
+    Qubit q is bit q of the basis-state index. Gates contract a reshaped view of
+    the state with einsum into a second buffer of the same size and swap, so
+    memory stays at two 2**n vectors however many gates run (20 qubits: 32 MiB
+    at complex128, 16 MiB at complex64). Diagonal gates are applied in place.
+    Consecutive single-qubit gates on a qubit are fused into one 2x2 matrix and
+    applied only when a two-qubit gate or a read needs that qubit.
+    """
+
+    def __init__(self, num_qubits: int, dtype=np.complex128):
+        self.num_qubits = num_qubits
+        self.dtype = np.dtype(dtype)
+        self._state = np.zeros(2 ** num_qubits, dtype=self.dtype)
+        self._scratch = np.empty_like(self._state)
+        self._pending: Dict[int, np.ndarray] = {}
+        self.contractions = 0  # gate applications actually run, after fusion
+        self.reset()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._state.nbytes + self._scratch.nbytes
+
+    def reset(self, amplitudes: Optional[np.ndarray] = None) -> "StatevectorSimulator":
+        """Start from |0...0>, or from amplitudes (normalised, zero-padded to 2**n)"""
+        self._pending.clear()
+        self._state.fill(0)
+        if amplitudes is None:
+            self._state[0] = 1
+            return self
+        amplitudes = np.asarray(amplitudes)[:self._state.size]
+        norm = np.linalg.norm(amplitudes)
+        if norm == 0:
+            raise ValueError("Cannot prepare a state from all-zero amplitudes")
+        np.divide(amplitudes, norm, out=self._state[:len(amplitudes)], casting='unsafe')
+        return self
+
+    # Single-qubit gates (fused)
+
+    def apply(self, gate: np.ndarray, qubit: int) -> "StatevectorSimulator":
+        pending = self._pending.get(qubit)
+        self._pending[qubit] = gate if pending is None else gate @ pending
+        return self
+
+    def rx(self, qubit: int, theta: float) -> "StatevectorSimulator":
+        return self.apply(rx_matrix(theta), qubit)
+
+    def ry(self, qubit: int, theta: float) -> "StatevectorSimulator":
+        return self.apply(ry_matrix(theta), qubit)
+
+    def rz(self, qubit: int, theta: float) -> "StatevectorSimulator":
+        return self.apply(rz_matrix(theta), qubit)
+
+    def h(self, qubit: int) -> "StatevectorSimulator":
+        return self.apply(HADAMARD, qubit)
+
+    def x(self, qubit: int) -> "StatevectorSimulator":
+        return self.apply(PAULI_X, qubit)
+
+    # Two-qubit gates
+
+    def apply_two(self, gate: np.ndarray, first: int, second: int) -> "StatevectorSimulator":
+        """4x4 gate in the |first second> basis (first is the high bit of the matrix index)"""
+        if first == second:
+            raise ValueError("Two-qubit gate needs two distinct qubits")
+        self._flush(first)
+        self._flush(second)
+        hi, lo = max(first, second), min(first, second)
+        tensor = np.asarray(gate, dtype=self.dtype).reshape(2, 2, 2, 2)
+        if first != hi:
+            tensor = tensor.transpose(1, 0, 3, 2)
+        shape = (2 ** (self.num_qubits - hi - 1), 2, 2 ** (hi - lo - 1), 2, 2 ** lo)
+        view = self._state.reshape(shape)
+
+        matrix = tensor.reshape(4, 4)
+        diagonal = np.diagonal(matrix)
+        if np.count_nonzero(matrix - np.diag(diagonal)) == 0:
+            for index, phase in enumerate(diagonal):
+                if phase != 1:
+                    view[:, index >> 1, :, index & 1, :] *= phase
+        elif np.all((matrix == 0) | (matrix == 1)) and np.all(np.count_nonzero(matrix, axis=1) == 1):
+            # Permutation (CNOT, SWAP): four quarter-size copies
+            out = self._scratch.reshape(shape)
+            for row, column in enumerate(np.argmax(matrix, axis=1)):
+                out[:, row >> 1, :, row & 1, :] = view[:, column >> 1, :, column & 1, :]
+            self._swap()
+        else:
+            np.einsum('ijkl,akblc->aibjc', tensor, view, out=self._scratch.reshape(shape))
+            self._swap()
+        self.contractions += 1
+        return self
+
+    def cnot(self, control: int, target: int) -> "StatevectorSimulator":
+        return self.apply_two(CNOT, control, target)
+
+    def cz(self, control: int, target: int) -> "StatevectorSimulator":
+        return self.apply_two(CZ, control, target)
+
+    # Reads
+
+    def flush(self) -> "StatevectorSimulator":
+        for qubit in list(self._pending):
+            self._flush(qubit)
+        return self
+
+    @property
+    def statevector(self) -> np.ndarray:
+        """The live state buffer (not a copy; later gates overwrite it)"""
+        return self.flush()._state
+
+    def probabilities(self) -> np.ndarray:
+        state = self.statevector
+        return state.real ** 2 + state.imag ** 2
+
+    def expectation_z(self) -> np.ndarray:
+        """<Z_q> for every qubit"""
+        probabilities = self.probabilities()
+        expectations = np.empty(self.num_qubits)
+        for qubit in range(self.num_qubits):
+            p = probabilities.reshape(-1, 2, 2 ** qubit).sum(axis=(0, 2))
+            expectations[qubit] = p[0] - p[1]
+        return expectations
+
+    def overlap(self, other: np.ndarray) -> complex:
+        """<self|other> for another statevector of the same size"""
+        return complex(np.vdot(self.statevector, other))
+
+    def _flush(self, qubit: int):
+        gate = self._pending.pop(qubit, None)
+        if gate is None:
+            return
+        view = self._state.reshape(-1, 2, 2 ** qubit)
+        if gate[0, 1] == 0 and gate[1, 0] == 0:
+            view[:, 0, :] *= gate[0, 0]
+            view[:, 1, :] *= gate[1, 1]
+            self.contractions += 1
+            return
+
+        gate = np.asarray(gate, dtype=self.dtype)
+        out = self._scratch.reshape(view.shape)
+        if view.shape[2] >= MATMUL_MIN_STRIDE:
+            np.matmul(gate, view, out=out)
+        else:
+            # Short strides: four scaled passes beat thousands of tiny matmuls
+            v0, v1, o0, o1 = view[:, 0, :], view[:, 1, :], out[:, 0, :], out[:, 1, :]
+            np.multiply(v0, gate[0, 0], out=o0)
+            np.multiply(v1, gate[0, 1], out=o1)
+            o0 += o1
+            np.multiply(v0, gate[1, 0], out=o1)
+            np.multiply(v1, gate[1, 1], out=v0)  # v0 is no longer needed
+            o1 += v0
+        self._swap()
+        self.contractions += 1
+
+    def _swap(self):
+        self._state, self._scratch = self._scratch, self._state
+
+
+class SPSAGradientEstimator:
+    """
+    Simultaneous Perturbation Stochastic Approximation. Each estimate perturbs
+    every parameter at once along random +/-1 directions, so it needs 2 circuit
+    evaluations per sample (returned as one stack for a single batched call)
+    instead of 2 per parameter. Gains decay with the iteration count.
+    """
+
+    def __init__(
+        self,
+        perturbation: float = SPSA_PERTURBATION,
+        alpha: float = SPSA_ALPHA,
+        gamma: float = SPSA_GAMMA,
+        stability: float = SPSA_STABILITY,
+        samples: int = 1,
+        seed: SeedLike = None
+    ):
+        self.perturbation = perturbation
+        self.alpha = alpha
+        self.gamma = gamma
+        self.stability = stability
+        self.samples = samples
+        self.rng = np.random.default_rng(make_seed_sequence(seed))
+        self.iteration = 0
+
+    @property
+    def perturbation_size(self) -> float:
+        """c_k"""
+        return self.perturbation / (self.iteration + 1) ** self.gamma
+
+    def step_size(self, learning_rate: float) -> float:
+        """a_k for a base learning rate a"""
+        return learning_rate * ((1 + self.stability) / (self.iteration + 1 + self.stability)) ** self.alpha
+
+    def perturb(self, parameters: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the (2 * samples, P) stack [θ + c_k Δ_1, θ - c_k Δ_1, θ + c_k Δ_2, ...]
+        and the (samples, P) directions Δ.
+        """
+        deltas = self.rng.choice((-1.0, 1.0), size=(self.samples, len(parameters)))
+        offsets = self.perturbation_size * deltas
+        stack = np.empty((2 * self.samples, len(parameters)))
+        stack[0::2] = parameters + offsets
+        stack[1::2] = parameters - offsets
+        return stack, deltas
+
+    def gradient(self, losses: np.ndarray, deltas: np.ndarray) -> np.ndarray:
+        """Gradient from the losses of a perturb() stack (same order); advances the schedule"""
+        losses = np.asarray(losses)
+        differences = (losses[0::2] - losses[1::2]) / (2 * self.perturbation_size)
+        self.iteration += 1
+        # 1/Δ = Δ for ±1 directions
+        return differences @ deltas / len(deltas)
+
+    def estimate(self, loss: Callable[[np.ndarray], np.ndarray], parameters: np.ndarray) -> np.ndarray:
+        """loss maps a (sets, P) parameter stack to (sets,) loss values in one call"""
+        stack, deltas = self.perturb(parameters)
+        return self.gradient(loss(stack), deltas)
+
+
 class QuantumVariationalOptimizer:
     """
     Variational Quantum Eigensolver (VQE) variant
@@ -36,34 +369,143 @@ class QuantumVariationalOptimizer:
     Based on research: "VQE for Optimization" (2024) and "Quantum-Classical Hybrid Methods" (2024)
     """
 
-    def __init__(self, num_qubits: int = 8, depth: int = 3):
+    def __init__(self, num_qubits: int = 8, depth: int = 3, seed: SeedLike = None, backend: str = "analytic"):
+        if backend not in ("analytic", "statevector"):
+            raise ValueError(f"Unknown backend: {backend}")
         self.num_qubits = num_qubits
         self.depth = depth
-        self.parameters = np.random.randn(depth * num_qubits * 3)
+        self.backend = backend
+        self.rng = np.random.default_rng(make_seed_sequence(seed))
+        self.parameters = self.rng.standard_normal(depth * num_qubits * 3)
+        self._simulators: Dict[int, StatevectorSimulator] = {}  # per thread, so executor tasks don't share buffers
+
+    @property
+    def energy_bound(self) -> float:
+        """Largest |energy| the analytic circuit can return (rotation plus entangler terms)"""
+        return float(self.depth * (2 * self.num_qubits - 1))
+
+    @property
+    def parameter_tensor(self) -> np.ndarray:
+        """Parameters as a (depth, 3, num_qubits) view: [rotation, phase, entangler] per layer"""
+        return self.parameters.reshape(self.depth, 3, self.num_qubits)
 
     def evaluate_circuit(self, data: np.ndarray) -> float:
         """Evaluate parameterized quantum circuit with classical data encoding"""
+        return float(self.evaluate_batch(np.asarray(data)[None, :])[0])
+
+    def evaluate_batch(
+        self,
+        data: np.ndarray,
+        parameters: Optional[np.ndarray] = None,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Evaluate the circuit for every row of a (batch, features) matrix at once.
+        Same energy as evaluate_circuit, as broadcast ops over (batch, depth, num_qubits).
+        parameters overrides self.parameters; a (sets, P) stack evaluates every
+        parameter set against every row in the same pass and returns (sets, batch).
+        With an executor, a stack is split into max_workers chunks (default
+        os.cpu_count()) and each chunk runs as a stacked task (worthwhile for
+        the statevector backend).
+        Process pools need this module registered in sys.modules; otherwise, or
+        if the pool breaks, the stack is evaluated in-process.
+        """
+        data = np.atleast_2d(data)
+        params = self.parameters if parameters is None else np.asarray(parameters)
+        if executor is not None and params.ndim == 2:
+            return self._evaluate_on_executor(data, params, executor, max_workers or os.cpu_count() or 1)
+        if self.backend == "statevector":
+            stack = np.atleast_2d(params)
+            energy = np.array([[self.simulate_circuit(row, p) for row in data] for p in stack])
+            return energy if params.ndim == 2 else energy[0]
+
+        stack = np.atleast_2d(params)
+        tensor = stack.reshape(len(stack), self.depth, 3, self.num_qubits)
         # Quantum feature map with data encoding
-        encoded_data = np.dot(data, self.parameters[:len(data)])
-
-        # Variational ansatz (hardware-efficient)
-        energy = 0.0
-        for d in range(self.depth):
-            param_slice = self.parameters[d*self.num_qubits*3:(d+1)*self.num_qubits*3]
-            # Single-qubit rotations with entanglement
-            for i in range(self.num_qubits):
-                angle = param_slice[i] + encoded_data
-                energy += np.sin(angle) * np.cos(param_slice[self.num_qubits + i])
-            # CNOT entanglement layer (classically simulated)
-            for i in range(self.num_qubits - 1):
-                energy += np.cos(param_slice[self.num_qubits*2 + i]) * np.sin(angle)
-
-        return energy
+        encoded_data = stack[:, :data.shape[1]] @ data.T
+
+        # Variational ansatz (hardware-efficient): single-qubit rotations...
+        angles = tensor[:, None, :, 0, :] + encoded_data[:, :, None, None]
+        sin_angles = np.sin(angles)
+        energy = np.einsum('kbdq,kdq->kb', sin_angles, np.cos(tensor[:, :, 1, :]))
+        # ...and the CNOT entanglement layer (classically simulated), driven by the last qubit's angle
+        entanglers = np.cos(tensor[:, :, 2, :-1]).sum(axis=2)
+        energy += np.einsum('kbd,kd->kb', sin_angles[..., -1], entanglers)
+
+        return energy if params.ndim == 2 else energy[0]
+
+    def _evaluate_on_executor(
+        self,
+        data: np.ndarray,
+        params: np.ndarray,
+        executor: Executor,
+        max_workers: int
+    ) -> np.ndarray:
+        if isinstance(executor, ProcessPoolExecutor) and not pool_importable():
+            warn_pool_fallback()
+            return self.evaluate_batch(data, params)
+
+        # The optimizer is pickled once per chunk rather than once per parameter set
+        chunks = np.array_split(params, min(max_workers, len(params)))
+        futures = [executor.submit(self.evaluate_batch, data, chunk) for chunk in chunks]
+        try:
+            return np.concatenate([future.result() for future in futures])
+        except POOL_ERRORS as e:
+            abandon_pool(futures, e)
+            return self.evaluate_batch(data, params)
+
+    def simulate_circuit(self, data: np.ndarray, parameters: Optional[np.ndarray] = None) -> float:
+        """
+        Run the hardware-efficient ansatz on the statevector simulator:
+        per layer RY(rotation + encoded data) and RZ(phase) on every qubit, then a
+        CNOT ladder with RZ(entangler) on each target. Energy is sum_q <Z_q>.
+        """
+        simulator = self._simulators.get(threading.get_ident())
+        if simulator is None:
+            simulator = self._simulators[threading.get_ident()] = StatevectorSimulator(self.num_qubits)
+        data = np.asarray(data)
+        flat = self.parameters if parameters is None else parameters
+        params = flat.reshape(self.depth, 3, self.num_qubits)
+        encoded_data = float(data @ flat[:len(data)])
+
+        simulator.reset()
+        for rotation, phase, entangler in params:
+            for qubit in range(self.num_qubits):
+                simulator.ry(qubit, rotation[qubit] + encoded_data).rz(qubit, phase[qubit])
+            for qubit in range(self.num_qubits - 1):
+                simulator.cnot(qubit, qubit + 1).rz(qubit + 1, entangler[qubit])
+
+        return float(simulator.expectation_z().sum())
+
+    def spsa_gradient(
+        self,
+        data: np.ndarray,
+        loss: Callable[[np.ndarray], np.ndarray],
+        estimator: SPSAGradientEstimator,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        SPSA gradient of loss(energies) with respect to the circuit parameters.
+        loss maps (sets, batch) energies to (sets,) losses; all perturbed
+        circuits run in one evaluate_batch call (or across the executor).
+        """
+        return estimator.estimate(
+            lambda stack: loss(self.evaluate_batch(data, parameters=stack, executor=executor, max_workers=max_workers)),
+            self.parameters
+        )
 
     def optimize_step(self, loss_gradient: np.ndarray, learning_rate: float = 0.01):
         """SPSA (Simultaneous Perturbation Stochastic Approximation) step"""
         self.parameters -= learning_rate * loss_gradient
 
+    def __getstate__(self) -> Dict:
+        # Simulator buffers are scratch space; don't ship 2**n vectors to pool workers
+        state = self.__dict__.copy()
+        state["_simulators"] = {}
+        return state
+
 
 class QuantumMLEncoder:
     """
@@ -72,35 +514,133 @@ class QuantumMLEncoder:
     Based on: "Quantum Feature Maps" (2024), "Barren Plateaus in QML" (2024)
     """
 
-    def __init__(self, feature_dim: int, num_qubits: int = 10):
+    def __init__(self, feature_dim: int, num_qubits: int = 10, backend: str = "amplitude"):
+        if backend not in ("amplitude", "statevector"):
+            raise ValueError(f"Unknown backend: {backend}")
         self.feature_dim = feature_dim
         self.num_qubits = num_qubits
+        self.backend = backend
         self.kernel_matrix = None
+        self._simulator = None
+        self._encodings: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+    def amplitude_encoding(self, data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Normalize data and encode as quantum state amplitudes (dense, 2**num_qubits).
+        Pass out to reuse a buffer instead of allocating one per call.
+        """
+        encoded = self.sparse_amplitude_encoding(data)
+        if out is not None and len(out) != encoded.size:
+            raise ValueError(f"out must have {encoded.size} elements, got {len(out)}")
+        return encoded.dense(out)
 
-    def amplitude_encoding(self, data: np.ndarray) -> np.ndarray:
-        """Normalize data and encode as quantum state amplitudes"""
-        normalized = data / (np.linalg.norm(data) + 1e-10)
-        # Pad to power of 2
+    def sparse_amplitude_encoding(self, data: np.ndarray) -> SparseAmplitudes:
+        """Amplitude encoding without the zero padding: only the first len(data) amplitudes are stored"""
         size = 2 ** self.num_qubits
-        if len(normalized) < size:
-            normalized = np.pad(normalized, (0, size - len(normalized)))
-        return normalized[:size]
+        data = np.asarray(data)
+        return SparseAmplitudes(values=data[:size] / (np.linalg.norm(data) + 1e-10), size=size)
 
     def angle_encoding(self, data: np.ndarray) -> np.ndarray:
         """Encode classical features as rotation angles"""
         return np.arctan2(data, np.ones_like(data))
 
+    def feature_map_state(self, data: np.ndarray, reps: int = 2) -> np.ndarray:
+        """
+        Simulated feature-map state: features are angle-encoded (folded onto
+        num_qubits), then reps x [H, RZ(2*angle) on every qubit, CZ ladder].
+        Returns the simulator's live buffer; copy it to keep it past the next call.
+        """
+        if self._simulator is None:
+            self._simulator = StatevectorSimulator(self.num_qubits)
+        angles = self.angle_encoding(np.asarray(data, dtype=float))
+        angles = np.bincount(np.arange(len(angles)) % self.num_qubits, weights=angles, minlength=self.num_qubits)
+
+        simulator = self._simulator.reset()
+        for _ in range(reps):
+            for qubit, angle in enumerate(angles):
+                simulator.h(qubit).rz(qubit, 2 * angle)
+            for qubit in range(self.num_qubits - 1):
+                simulator.cz(qubit, qubit + 1)
+        return simulator.statevector
+
     def quantum_kernel(self, x1: np.ndarray, x2: np.ndarray) -> float:
         """
         Quantum kernel function: fidelity between encoded states.
         Classical simulation of quantum kernel evaluation.
         """
-        encoded_x1 = self.amplitude_encoding(x1)
-        encoded_x2 = self.amplitude_encoding(x2)
-        # Fidelity = |<ψ1|ψ2>|²
-        fidelity = np.abs(np.dot(encoded_x1.conj(), encoded_x2)) ** 2
+        if self.backend == "statevector":
+            state_x1 = self.feature_map_state(x1).copy()
+            return float(np.abs(np.vdot(state_x1, self.feature_map_state(x2))) ** 2)
+        encoded_x1 = self.sparse_amplitude_encoding(x1)
+        encoded_x2 = self.sparse_amplitude_encoding(x2)
+        # Fidelity = |<ψ1|ψ2>|² over the populated prefixes
+        fidelity = np.abs(encoded_x2.dot(encoded_x1.values.conj())) ** 2
         return fidelity
 
+    def encode_batch(self, data: np.ndarray) -> np.ndarray:
+        """
+        Encode every row of a (samples, features) matrix once. Amplitude encoding
+        keeps only the populated prefix (zero padding never changes an overlap);
+        the statevector backend returns full 2**num_qubits states. Results are
+        cached per distinct input, so repeated Gram computations skip encoding.
+        """
+        data = np.ascontiguousarray(np.atleast_2d(data), dtype=float)
+        key = (self.backend, data.shape, hashlib.blake2b(data.tobytes(), digest_size=16).digest())
+        encoded = self._encodings.get(key)
+        if encoded is not None:
+            self._encodings.move_to_end(key)
+            return encoded
+
+        if self.backend == "statevector":
+            encoded = np.empty((len(data), 2 ** self.num_qubits), dtype=complex)
+            for row, sample in zip(encoded, data):
+                row[:] = self.feature_map_state(sample)
+        else:
+            # Normalise over all features before truncating, as amplitude_encoding does
+            width = min(data.shape[1], 2 ** self.num_qubits)
+            encoded = data[:, :width] / (np.linalg.norm(data, axis=1, keepdims=True) + 1e-10)
+
+        self._encodings[key] = encoded
+        if len(self._encodings) > ENCODING_CACHE_SIZE:
+            self._encodings.popitem(last=False)
+        return encoded
+
+    def gram_matrix(
+        self,
+        X: np.ndarray,
+        Y: Optional[np.ndarray] = None,
+        tile_size: int = GRAM_TILE_SIZE,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Quantum kernel for all pairs: K[i, j] = |<psi(X_i)|psi(Y_j)>|^2, computed
+        tile by tile as |A B^H|^2 so temporaries stay at tile_size^2. With Y
+        omitted only the upper triangle is computed and mirrored, and the result
+        is kept as kernel_matrix. Pass out (e.g. an np.memmap) when the full
+        matrix does not fit in memory.
+        """
+        A = self.encode_batch(X)
+        symmetric = Y is None
+        B = A if symmetric else self.encode_batch(Y)
+        width = min(A.shape[1], B.shape[1])
+        A, B = A[:, :width], B[:, :width]
+
+        gram = np.empty((len(A), len(B))) if out is None else out
+        for r0 in range(0, len(A), tile_size):
+            r1 = min(r0 + tile_size, len(A))
+            for c0 in range(r0 if symmetric else 0, len(B), tile_size):
+                c1 = min(c0 + tile_size, len(B))
+                overlaps = A[r0:r1] @ B[c0:c1].conj().T
+                fidelities = np.square(overlaps.real) + np.square(overlaps.imag) \
+                    if np.iscomplexobj(overlaps) else np.square(overlaps, out=overlaps)
+                gram[r0:r1, c0:c1] = fidelities
+                if symmetric and c0 != r0:
+                    gram[c0:c1, r0:r1] = fidelities.T
+
+        if symmetric:
+            self.kernel_matrix = gram
+        return gram
+
 
 class HybridQuantumClassicalSolver:
     """
@@ -109,10 +649,14 @@ class HybridQuantumClassicalSolver:
     Based on: "Hybrid Quantum-Classical Algorithms" (2024)
     """
 
-    def __init__(self, num_qubits: int = 12, classical_model: str = "neural_net"):
-        self.quantum_engine = QuantumVariationalOptimizer(num_qubits, depth=4)
+    def __init__(self, num_qubits: int = 12, classical_model: str = "neural_net", seed: SeedLike = None):
+        engine_seed, solver_seed, spsa_seed = make_seed_sequence(seed).spawn(3)
+        self.rng = np.random.default_rng(solver_seed)
+        self.quantum_engine = QuantumVariationalOptimizer(num_qubits, depth=4, seed=engine_seed)
+        self.gradient_estimator = SPSAGradientEstimator(seed=spsa_seed)
         self.ml_encoder = QuantumMLEncoder(feature_dim=50, num_qubits=num_qubits)
-        self.classical_weights = np.random.randn(50)
+        self.classical_weights = self.rng.standard_normal(50)
+        self.quantum_weight = 0.0  # scale of the circuit energy in the prediction; learned by fit()
         self.iteration = 0
 
     def predict(self, features: np.ndarray) -> Tuple[float, float]:
@@ -120,30 +664,160 @@ class HybridQuantumClassicalSolver:
         Hybrid prediction: quantum feature extraction + classical regression
         Returns: (prediction, confidence_score)
         """
-        # Quantum feature extraction
-        quantum_features = self.ml_encoder.amplitude_encoding(features)
+        return self._predict_encoded(self.ml_encoder.sparse_amplitude_encoding(features))
 
-        # Classical prediction layer
-        prediction = np.dot(quantum_features[:len(self.classical_weights)], self.classical_weights)
+    def _predict_encoded(self, quantum_features: SparseAmplitudes) -> Tuple[float, float]:
+        # Classical prediction layer (padding contributes nothing, so only the populated slice is read)
+        prediction = quantum_features.dot(self.classical_weights)
+        if self.quantum_weight:
+            circuit_input = quantum_features.values[:len(self.classical_weights)]
+            prediction += self.quantum_weight * self._circuit_features(circuit_input[None, :])[0]
 
         # Confidence based on feature magnitude and consistency
-        confidence = np.clip(np.mean(np.abs(quantum_features[:10])), 0, 1)
+        confidence = np.clip(np.mean(np.abs(quantum_features.head(10))), 0, 1)
 
         return float(prediction), float(confidence)
 
+    def predict_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """predict() for every row of a (samples, features) matrix; returns (predictions, confidences)"""
+        encoded, confidences = self._encode_rows(features)
+        predictions = encoded @ self.classical_weights[:encoded.shape[1]]
+        if self.quantum_weight:
+            predictions += self.quantum_weight * self._circuit_features(encoded)
+        return predictions, confidences
+
+    @staticmethod
+    def predict_stacked(
+        solvers: List["HybridQuantumClassicalSolver"],
+        features: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Row i of features through solvers[i]: every solver's classical layer runs
+        as one stacked product; circuits are evaluated only for solvers with a
+        non-zero quantum weight.
+        """
+        encoded, confidences = solvers[0]._encode_rows(features)
+        width = encoded.shape[1]
+        weights = np.stack([solver.classical_weights[:width] for solver in solvers])
+        predictions = np.einsum('mk,mk->m', encoded, weights)
+        for index, solver in enumerate(solvers):
+            if solver.quantum_weight:
+                predictions[index] += solver.quantum_weight * solver._circuit_features(encoded[index:index + 1])[0]
+        return predictions, confidences
+
+    def _encode_rows(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Amplitude-encoded populated prefixes (one row per sample) and their confidences"""
+        features = np.atleast_2d(features)
+        size = 2 ** self.ml_encoder.num_qubits
+        width = min(features.shape[1], size, len(self.classical_weights))
+        # Normalise over all features before truncating, as sparse_amplitude_encoding does
+        encoded = features[:, :width] / (np.linalg.norm(features, axis=1, keepdims=True) + 1e-10)
+
+        # Mean |amplitude| over the first 10 (zero padding counts toward the mean)
+        confidences = np.clip(np.abs(encoded[:, :10]).sum(axis=1) / min(10, size), 0, 1)
+        return encoded, confidences
+
     def train_step(self, features: np.ndarray, target: float, learning_rate: float = 0.01):
         """Training step updating both quantum and classical components"""
-        pred, conf = self.predict(features)
-        loss = (pred - target) ** 2
-
-        # Classical weight update (gradient descent)
-        quantum_features = self.ml_encoder.amplitude_encoding(features)
-        gradient = 2 * (pred - target) * quantum_features[:len(self.classical_weights)]
-        self.classical_weights -= learning_rate * gradient
-
-        # Quantum parameter update (SPSA approximation)
-        spsa_gradient = np.random.randn(len(self.quantum_engine.parameters)) * np.sqrt(loss)
-        self.quantum_engine.optimize_step(spsa_gradient, learning_rate)
+        quantum_features = self.ml_encoder.sparse_amplitude_encoding(features)
+        encoded = quantum_features.values[:len(self.classical_weights)]
+        return self._fit_batch(encoded[None, :], np.array([target], dtype=float), learning_rate)
+
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        batch_size: int = 32,
+        epochs: int = 10,
+        learning_rate: float = 0.01,
+        validation_split: float = 0.2,
+        patience: int = 3
+    ) -> Dict:
+        """
+        Minibatch training over a whole dataset. Rows are amplitude-encoded once;
+        each minibatch takes an analytic gradient step for the classical weights
+        and the quantum weight, and an SPSA step (gradient_estimator) for the
+        circuit parameters whose base and +/- perturbed evaluations run as one
+        stacked evaluate_batch call.
+        Stops when validation loss has not improved for `patience` epochs and
+        restores the best weights. Returns the loss history.
+        """
+        X = np.atleast_2d(X)
+        y = np.asarray(y, dtype=float)
+        if len(X) != len(y):
+            raise ValueError("X and y must have the same number of rows")
+
+        width = min(X.shape[1], len(self.classical_weights))
+        encoded = self.ml_encoder.encode_batch(X)[:, :width]
+
+        order = self.rng.permutation(len(X))
+        n_val = int(len(X) * validation_split) if len(X) > 1 else 0
+        val_idx, train_idx = order[:n_val], order[n_val:]
+
+        history = {"train_loss": [], "val_loss": [], "best_epoch": 0, "stopped_early": False}
+        best_loss, best_state, stale = float('inf'), None, 0
+
+        for epoch in range(epochs):
+            epoch_loss = 0.0
+            shuffled = self.rng.permutation(train_idx)
+            for start in range(0, len(shuffled), batch_size):
+                batch = shuffled[start:start + batch_size]
+                epoch_loss += self._fit_batch(encoded[batch], y[batch], learning_rate) * len(batch)
+            history["train_loss"].append(epoch_loss / max(len(train_idx), 1))
+
+            # Early stopping on the held-out split (training loss when there is none)
+            monitored = self._batch_loss(encoded[val_idx], y[val_idx]) if n_val else history["train_loss"][-1]
+            history["val_loss"].append(monitored)
+            if monitored < best_loss:
+                best_loss, stale = monitored, 0
+                history["best_epoch"] = epoch
+                best_state = (
+                    self.classical_weights.copy(), self.quantum_weight, self.quantum_engine.parameters.copy()
+                )
+            else:
+                stale += 1
+                if stale >= patience:
+                    history["stopped_early"] = True
+                    break
+
+        if best_state is not None:
+            self.classical_weights, self.quantum_weight, self.quantum_engine.parameters = best_state
+        return history
+
+    def _batch_loss(self, encoded: np.ndarray, targets: np.ndarray) -> float:
+        predictions = encoded @ self.classical_weights[:encoded.shape[1]]
+        if self.quantum_weight:
+            predictions += self.quantum_weight * self._circuit_features(encoded)
+        return float(np.mean((predictions - targets) ** 2))
+
+    def _circuit_features(self, encoded: np.ndarray, parameters: Optional[np.ndarray] = None) -> np.ndarray:
+        """Circuit energy scaled into [-1, 1], so the quantum weight trains at the classical learning rate"""
+        engine = self.quantum_engine
+        return engine.evaluate_batch(encoded, parameters=parameters) / engine.energy_bound
+
+    def _fit_batch(self, encoded: np.ndarray, targets: np.ndarray, learning_rate: float) -> float:
+        """One minibatch update; returns the loss before the update"""
+        width = encoded.shape[1]
+        engine = self.quantum_engine
+        classical = encoded @ self.classical_weights[:width]
+
+        # Base and SPSA-perturbed circuits in one stacked evaluation
+        estimator = self.gradient_estimator
+        perturbed, deltas = estimator.perturb(engine.parameters)
+        energies = self._circuit_features(encoded, parameters=np.vstack([engine.parameters, perturbed]))
+
+        residual = classical + self.quantum_weight * energies[0] - targets
+        loss = float(np.mean(residual ** 2))
+
+        # With quantum_weight == 0 the circuit parameters have no effect on the loss, so skip the step
+        if self.quantum_weight:
+            losses = np.mean((classical + self.quantum_weight * energies[1:] - targets) ** 2, axis=1)
+            step = estimator.step_size(learning_rate)
+            engine.optimize_step(estimator.gradient(losses, deltas), step)
+
+        scale = 2 / len(targets)
+        self.classical_weights[:width] -= learning_rate * scale * (encoded.T @ residual)
+        self.quantum_weight -= learning_rate * scale * float(residual @ energies[0])
 
         self.iteration += 1
         return loss
@@ -156,9 +830,10 @@ class QuantumAnnealingOptimizer:
     Based on: "QAOA with Warm-Starting" (2024), "Barren Plateaus and Initialization" (2024)
     """
 
-    def __init__(self, problem_size: int, num_layers: int = 3):
+    def __init__(self, problem_size: int, num_layers: int = 3, seed: SeedLike = None):
         self.problem_size = problem_size
         self.num_layers = num_layers
+        self.rng = np.random.default_rng(make_seed_sequence(seed))
         self.gamma = np.ones(num_layers) * 0.5  # Problem Hamiltonian params
         self.beta = np.ones(num_layers) * 0.5   # Mixer Hamiltonian params
 
@@ -166,28 +841,229 @@ class QuantumAnnealingOptimizer:
         """Evaluate cost for a candidate solution"""
         return np.dot(bitstring, np.dot(cost_matrix, bitstring))
 
+    def batch_costs(self, bitstrings: np.ndarray, cost_matrix: np.ndarray) -> np.ndarray:
+        """x^T Q x for every row of a (candidates, problem_size) matrix, via one matrix multiply"""
+        bitstrings = np.atleast_2d(bitstrings)
+        return np.einsum('bi,bi->b', bitstrings @ cost_matrix, bitstrings)
+
     def optimize(self, cost_matrix: np.ndarray, iterations: int = 100) -> np.ndarray:
         """
         QAOA optimization: alternates between problem and mixer Hamiltonians.
         Returns best found bitstring solution.
         """
-        best_cost = float('inf')
-        best_solution = None
+        # Random bitstrings, drawn and costed in one batch
+        candidates = self.rng.integers(0, 2, (iterations, self.problem_size))
+        costs = self.batch_costs(candidates, cost_matrix)
+
+        # Each new best (strictly below everything before it) updates the parameters, in order
+        previous_best = np.concatenate([[np.inf], np.minimum.accumulate(costs)[:-1]])
+        for cost in costs[costs < previous_best]:
+            # Update parameters (simplified SPSA)
+            self.gamma *= (1 - 0.01 * cost / np.max(cost_matrix))
+            self.beta *= (1 + 0.01 * cost / np.max(cost_matrix))
+
+        return candidates[np.argmin(costs)] if iterations else None
+
+    def anneal(
+        self,
+        cost_matrix: np.ndarray,
+        sweeps: int = ANNEAL_SWEEPS,
+        chains: int = ANNEAL_CHAINS,
+        method: str = "annealing",
+        temperatures: Optional[Tuple[float, float]] = None
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Minimise x^T Q x over bitstrings with single-bit-flip Metropolis chains,
+        all advanced together as (chains, problem_size) arrays. Each chain keeps
+        its local fields x @ (Q + Q^T), so a flip's energy change is O(1) and
+        updating the fields after an accepted flip is O(n).
+
+        method="annealing": every chain cools geometrically from hot to cold.
+        method="tempering": chains sit on a fixed geometric temperature ladder
+        and neighbours exchange states after every sweep (parallel tempering).
+        temperatures is (hot, cold); by default it is scaled from the largest
+        possible single-flip change. Returns (best bitstring, its cost).
+        """
+        if method not in ("annealing", "tempering"):
+            raise ValueError(f"Unknown method: {method}")
+        Q = np.asarray(cost_matrix, dtype=float)
+        n = len(Q)
+        symmetric = Q + Q.T
+        diagonal = np.diag(Q).copy()
+
+        if temperatures is None:
+            scale = np.abs(symmetric).sum(axis=1).max() or 1.0
+            temperatures = (scale, scale * 1e-3)
+        hot, cold = temperatures
+        if method == "annealing":
+            schedule = np.geomspace(hot, cold, sweeps)
+        else:
+            ladder = np.geomspace(cold, hot, chains)
+
+        states = self.rng.integers(0, 2, (chains, n)).astype(float)
+        fields = states @ symmetric
+        energies = self.batch_costs(states, Q)
+        best_index = int(np.argmin(energies))
+        best_state, best_energy = states[best_index].copy(), float(energies[best_index])
+
+        for sweep in range(sweeps):
+            temperature = schedule[sweep] if method == "annealing" else ladder
+            # Metropolis threshold per (site, chain): accept when dE <= -T log(u)
+            thresholds = -np.log(self.rng.random((n, chains))) * temperature
+            for site, threshold in zip(self.rng.permutation(n), thresholds):
+                column = states[:, site]
+                direction = 1 - 2 * column
+                delta = direction * (diagonal[site] + fields[:, site] - 2 * diagonal[site] * column)
+                accepted = np.flatnonzero(delta <= threshold)
+                if len(accepted):
+                    states[accepted, site] += direction[accepted]
+                    fields[accepted] += direction[accepted, None] * symmetric[site]
+                    energies[accepted] += delta[accepted]
+
+            if method == "tempering":
+                # Replica exchange between neighbouring temperatures (even pairs, then odd)
+                start = sweep % 2
+                lower = np.arange(start, chains - 1, 2)
+                upper = lower + 1
+                betas = 1 / ladder
+                log_accept = (betas[lower] - betas[upper]) * (energies[lower] - energies[upper])
+                swap = np.log(self.rng.random(len(lower))) < log_accept
+                i, j = lower[swap], upper[swap]
+                states[[*i, *j]] = states[[*j, *i]]
+                fields[[*i, *j]] = fields[[*j, *i]]
+                energies[[*i, *j]] = energies[[*j, *i]]
+
+            sweep_best = int(np.argmin(energies))
+            if energies[sweep_best] < best_energy:
+                best_state, best_energy = states[sweep_best].copy(), float(energies[sweep_best])
+
+        return best_state.astype(int), float(self.cost_function(best_state, Q))
+
+
+class RollingFeatureWindow:
+    """
+    Fixed-size ring buffer over the most recent points of a series, keeping the
+    running sums behind QuantumTimeSeriesPredictor.extract_features: sum and
+    sum of squares of the values and of their first differences, the
+    time-weighted sum (trend slope) and the lag-1 cross-product
+    (autocorrelation). append() updates them in O(1) and recomputes them
+    from the buffer every time the ring wraps, so rounding error never
+    accumulates past one window's worth of appends (still O(1) amortized);
+    features() is O(1) apart from the mean-reversion share, a single
+    comparison over the buffer.
+    A 2-D (series, points) buffer advances every series together.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.buffer = np.array(values, dtype=float)
+        self.size = self.buffer.shape[-1]
+        if self.size < 3:
+            raise ValueError("Need at least 3 points for rolling features")
+        self.head = 0  # position of the oldest point
+        self.resync()
+
+    def resync(self):
+        """Recompute every running sum from the buffer (O(window); bounds float drift)"""
+        x = self.window()
+        diffs = np.diff(x, axis=-1)
+        self.total = x.sum(axis=-1)
+        self.total_sq = (x * x).sum(axis=-1)
+        self.weighted = x @ np.arange(self.size)
+        self.cross = (x[..., :-1] * x[..., 1:]).sum(axis=-1)
+        self.diff_total = diffs.sum(axis=-1)
+        self.diff_total_sq = (diffs * diffs).sum(axis=-1)
+
+    def window(self) -> np.ndarray:
+        """Points oldest to newest (a copy)"""
+        return np.roll(self.buffer, -self.head, axis=-1)
+
+    @property
+    def first(self) -> np.ndarray:
+        return self.buffer[..., self.head]
+
+    @property
+    def last(self) -> np.ndarray:
+        return self.buffer[..., self.head - 1]
+
+    def append(self, value: Union[float, np.ndarray]):
+        """Drop the oldest point and add value (one per series) as the newest"""
+        oldest, second, last = self.first, self.buffer[..., (self.head + 1) % self.size], self.last
+        evicted_diff, new_diff = second - oldest, value - last
+
+        # Shifting every time index down by one subtracts the sum of the surviving points
+        self.weighted += (self.size - 1) * value - (self.total - oldest)
+        self.total += value - oldest
+        self.total_sq += value * value - oldest * oldest
+        self.cross += last * value - oldest * second
+        self.diff_total += new_diff - evicted_diff
+        self.diff_total_sq += new_diff * new_diff - evicted_diff * evicted_diff
+
+        self.buffer[..., self.head] = value
+        self.head = (self.head + 1) % self.size
+        if self.head == 0:
+            self.resync()
+
+    def features(self) -> np.ndarray:
+        """Same features, in the same order, as extract_features on window(); (..., 6)"""
+        n = self.size
+        first, last = self.first, self.last
+        mean = self.total / n
+
+        # Momentum (rate of change)
+        diff_mean = self.diff_total / (n - 1)
+        diff_std = np.sqrt(np.maximum(self.diff_total_sq / (n - 1) - diff_mean ** 2, 0.0))
+
+        # Volatility
+        volatility = np.sqrt(np.maximum(self.total_sq / n - mean ** 2, 0.0))
+
+        # Trend (least-squares slope against t = 0..n-1)
+        t_sum, t_sq_sum = n * (n - 1) / 2, (n - 1) * n * (2 * n - 1) / 6
+        trend = (n * self.weighted - t_sum * self.total) / (n * t_sq_sum - t_sum ** 2)
+
+        # Autocorrelation (lag-1): x[:-1] drops the newest point, x[1:] the oldest
+        m = n - 1
+        a_sum, b_sum = self.total - last, self.total - first
+        a_sq, b_sq = self.total_sq - last * last, self.total_sq - first * first
+        covariance = self.cross - a_sum * b_sum / m
+        spread = (a_sq - a_sum ** 2 / m) * (b_sq - b_sum ** 2 / m)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            lag1_corr = np.where(spread > 0, covariance / np.sqrt(np.maximum(spread, 0.0)), np.nan)
 
-        for _ in range(iterations):
-            # Random bitstring
-            candidate = np.random.randint(0, 2, self.problem_size)
-            cost = self.cost_function(candidate, cost_matrix)
+        # Mean reversion signal
+        above_mean = np.count_nonzero(self.buffer > np.expand_dims(mean, -1), axis=-1) / n
 
-            if cost < best_cost:
-                best_cost = cost
-                best_solution = candidate
+        return np.stack([diff_mean, diff_std, volatility, trend, lag1_corr, above_mean], axis=-1)
 
-                # Update parameters (simplified SPSA)
-                self.gamma *= (1 - 0.01 * cost / np.max(cost_matrix))
-                self.beta *= (1 + 0.01 * cost / np.max(cost_matrix))
 
-        return best_solution
+@dataclass
+class BatchPredictionResult:
+    """Columnar predictions for many series: one array entry per series"""
+    prediction: np.ndarray
+    confidence: np.ndarray
+    upper_bound: np.ndarray
+    lower_bound: np.ndarray
+    trend_up: np.ndarray
+    forecast_horizon: int
+    quantum_advantage_factor: float
+    timestamp: str
+
+    def __len__(self) -> int:
+        return len(self.prediction)
+
+    def row(self, index: int) -> PredictionResult:
+        """One series as a PredictionResult, as QuantumTimeSeriesPredictor.predict returns it"""
+        return PredictionResult(
+            prediction=float(self.prediction[index]),
+            confidence=float(self.confidence[index]),
+            upper_bound=float(self.upper_bound[index]),
+            lower_bound=float(self.lower_bound[index]),
+            reasoning=f"Quantum ML model with {self.forecast_horizon}-step horizon. Trend: {'up' if self.trend_up[index] else 'down'}",
+            data_quality_score=0.85,
+            time_horizon=f"{self.forecast_horizon} steps",
+            quantum_advantage_factor=self.quantum_advantage_factor,
+            timestamp=self.timestamp,
+            warnings=[]
+        )
 
 
 class QuantumTimeSeriesPredictor:
@@ -197,17 +1073,19 @@ class QuantumTimeSeriesPredictor:
     Based on: "Quantum Convolutional Neural Networks" (2024)
     """
 
-    def __init__(self, sequence_length: int = 60, forecast_horizon: int = 30):
+    def __init__(self, sequence_length: int = 60, forecast_horizon: int = 30, seed: SeedLike = None):
+        solver_seed, trend_seed = make_seed_sequence(seed).spawn(2)
         self.sequence_length = sequence_length
         self.forecast_horizon = forecast_horizon
-        self.hybrid_solver = HybridQuantumClassicalSolver(num_qubits=14)
+        self.hybrid_solver = HybridQuantumClassicalSolver(num_qubits=14, seed=solver_seed)
         self.historical_data = []
-        self.trend_model = np.poly1d(np.polyfit(range(10), np.random.randn(10), 2))
+        trend_noise = np.random.default_rng(trend_seed).standard_normal(10)
+        self.trend_model = np.poly1d(np.polyfit(range(10), trend_noise, 2))
 
     def normalize_timeseries(self, data: np.ndarray) -> np.ndarray:
-        """Min-max normalization"""
-        min_val = np.min(data)
-        max_val = np.max(data)
+        """Min-max normalization (per row for a (series, points) matrix)"""
+        min_val = np.min(data, axis=-1, keepdims=True)
+        max_val = np.max(data, axis=-1, keepdims=True)
         return (data - min_val) / (max_val - min_val + 1e-10)
 
     def extract_features(self, sequence: np.ndarray) -> np.ndarray:
@@ -248,12 +1126,12 @@ class QuantumTimeSeriesPredictor:
         recent = historical_sequence[-self.sequence_length:]
         normalized = self.normalize_timeseries(recent)
 
-        # Extract quantum features
-        features = self.extract_features(normalized)
+        # Extract quantum features; the rolling window updates them in O(1) per forecast step
+        window = RollingFeatureWindow(normalized)
+        features = window.features()
 
         # Make predictions for each horizon step
         predictions = []
-        current_seq = list(normalized)
 
         for step in range(self.forecast_horizon):
             # Quantum-classical hybrid prediction
@@ -263,13 +1141,9 @@ class QuantumTimeSeriesPredictor:
             pred_clipped = np.clip(pred, 0, 1)
             predictions.append(pred_clipped)
 
-            # Update sequence
-            current_seq.append(pred_clipped)
-            if len(current_seq) > self.sequence_length:
-                current_seq = current_seq[-self.sequence_length:]
-
-            # Re-extract features from updated sequence
-            features = self.extract_features(np.array(current_seq))
+            # Slide the window forward and update features from the running sums
+            window.append(pred_clipped)
+            features = window.features()
 
         # Calculate bounds based on volatility
         pred_array = np.array(predictions)
@@ -282,7 +1156,7 @@ class QuantumTimeSeriesPredictor:
 
         return PredictionResult(
             prediction=float(denorm_predictions[-1]),  # Final prediction
-            confidence=float(np.mean(confidence for _ in range(1))),
+            confidence=float(confidence),  # final step's confidence
             upper_bound=float(denorm_predictions[-1] + 2*volatility*(max_val-min_val)),
             lower_bound=float(denorm_predictions[-1] - 2*volatility*(max_val-min_val)),
             reasoning=f"Quantum ML model with {self.forecast_horizon}-step horizon. Trend: {'up' if np.mean(np.diff(predictions)) > 0 else 'down'}",
@@ -294,6 +1168,85 @@ class QuantumTimeSeriesPredictor:
         )
 
 
+    def predict_many(self, series: Union[np.ndarray, List[np.ndarray]]) -> BatchPredictionResult:
+        """
+        predict() for many series in one vectorized pass: a (series, points)
+        matrix or a list of ragged 1-D series, each with at least
+        sequence_length points. Every series' rolling window, features and
+        hybrid-solver prediction advance together along the series axis, so
+        the Python loop runs forecast_horizon times regardless of universe size.
+        """
+        if isinstance(series, np.ndarray) and series.ndim == 2:
+            if series.shape[1] < self.sequence_length:
+                raise ValueError(f"Need at least {self.sequence_length} historical points")
+            recent = series[:, -self.sequence_length:]
+            min_val, max_val = series.min(axis=1), series.max(axis=1)
+        else:
+            series = [np.asarray(s, dtype=float) for s in series]
+            for index, values in enumerate(series):
+                if len(values) < self.sequence_length:
+                    raise ValueError(f"Need at least {self.sequence_length} historical points (series {index})")
+            recent = np.stack([values[-self.sequence_length:] for values in series])
+            min_val = np.array([values.min() for values in series])
+            max_val = np.array([values.max() for values in series])
+
+        window = RollingFeatureWindow(self.normalize_timeseries(recent))
+        predictions, confidence = self._rollout(window, self.hybrid_solver.predict_batch)
+        return self._batch_result(predictions, confidence, min_val, max_val)
+
+    def _rollout(
+        self,
+        window: RollingFeatureWindow,
+        predict_rows: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Forecast every row of a 2-D window forecast_horizon steps; returns (predictions, final confidences)"""
+        features = window.features()
+        predictions = np.empty((len(window.buffer), self.forecast_horizon))
+        for step in range(self.forecast_horizon):
+            pred, confidence = predict_rows(features)
+            predictions[:, step] = np.clip(pred, 0, 1)
+            window.append(predictions[:, step])
+            features = window.features()
+        return predictions, confidence
+
+    def _batch_result(
+        self,
+        predictions: np.ndarray,
+        confidence: np.ndarray,
+        min_val: Union[float, np.ndarray],
+        max_val: Union[float, np.ndarray]
+    ) -> BatchPredictionResult:
+        # Bounds from each row's forecast volatility, then denormalize
+        volatility = predictions.std(axis=1) if self.forecast_horizon > 1 else np.full(len(predictions), 0.1)
+        value_range = max_val - min_val
+        final = predictions[:, -1] * value_range + min_val
+
+        return BatchPredictionResult(
+            prediction=final,
+            confidence=confidence,
+            upper_bound=final + 2 * volatility * value_range,
+            lower_bound=final - 2 * volatility * value_range,
+            trend_up=np.diff(predictions, axis=1).mean(axis=1) > 0,
+            forecast_horizon=self.forecast_horizon,
+            quantum_advantage_factor=1.45,  # Estimated speedup vs classical
+            timestamp=datetime.now().isoformat()
+        )
+
+
+# ===== ENSEMBLE POOL WORKERS =====
+
+_pool_members: List["QuantumTimeSeriesPredictor"] = []
+
+
+def _init_pool_members(members: List["QuantumTimeSeriesPredictor"]):
+    """Pool initializer: receive the ensemble members once per worker"""
+    _pool_members[:] = members
+
+
+def _pool_member_predict(index: int, data: np.ndarray) -> "PredictionResult":
+    return _pool_members[index].predict(data)
+
+
 class QuantumEnsemblePredictor:
     """
     Ensemble of quantum predictors for improved robustness.
@@ -301,29 +1254,60 @@ class QuantumEnsemblePredictor:
     Based on: "Quantum Ensemble Methods" (2024)
     """
 
-    def __init__(self, num_ensemble_members: int = 5):
-        self.predictors = [QuantumTimeSeriesPredictor() for _ in range(num_ensemble_members)]
+    def __init__(
+        self,
+        num_ensemble_members: int = 5,
+        seed: SeedLike = None,
+        strategy: str = "vectorized",
+        executor: Optional[Executor] = None
+    ):
+        """
+        strategy picks how members run:
+        - "vectorized": members share one rolling window stacked along a member
+          axis and their solvers score it in one stacked call per forecast step
+        - "pool": each member's predict() runs as an executor task. If no
+          executor is given, a ProcessPoolExecutor is created on first use and
+          the members are copied into its workers once, at startup (close() and
+          predict again after changing members). A caller's executor gets the
+          member with every task. Process pools need this module registered in
+          sys.modules; otherwise, or if the pool breaks, members run serially
+        - "serial": one member after another
+        """
+        if strategy not in ("vectorized", "pool", "serial"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        member_seeds = make_seed_sequence(seed).spawn(num_ensemble_members)
+        self.predictors = [QuantumTimeSeriesPredictor(seed=s) for s in member_seeds]
         self.ensemble_weights = np.ones(num_ensemble_members) / num_ensemble_members
+        self.strategy = strategy
+        self.executor = executor
+        self._owns_executor = False
+
+    def close(self):
+        """Shut down an executor the ensemble created itself"""
+        if self._owns_executor:
+            self.executor.shutdown()
+            self.executor, self._owns_executor = None, False
 
     def predict(self, data: np.ndarray) -> PredictionResult:
         """Ensemble prediction with weighted averaging"""
-        predictions = []
-
-        for predictor in self.predictors:
-            try:
-                result = predictor.predict(data)
-                predictions.append(result)
-            except Exception as e:
-                print(f"Ensemble member failed: {e}")
-
+        if self.strategy == "vectorized":
+            members = self._predict_vectorized(np.asarray(data))
+        elif self.strategy == "pool":
+            members = self._predict_pool(data)
+        else:
+            members = self._predict_serial(data)
+
+        succeeded = [index for index, result in enumerate(members) if result is not None]
+        predictions = [members[index] for index in succeeded]
         if not predictions:
             raise ValueError("All ensemble members failed")
 
-        # Average predictions
-        avg_pred = np.mean([p.prediction for p in predictions])
-        avg_confidence = np.mean([p.confidence for p in predictions])
-        avg_upper = np.mean([p.upper_bound for p in predictions])
-        avg_lower = np.mean([p.lower_bound for p in predictions])
+        # Weighted average over the members that succeeded
+        weights = self.ensemble_weights[succeeded] / np.sum(self.ensemble_weights[succeeded])
+        avg_pred = weights @ [p.prediction for p in predictions]
+        avg_confidence = weights @ [p.confidence for p in predictions]
+        avg_upper = weights @ [p.upper_bound for p in predictions]
+        avg_lower = weights @ [p.lower_bound for p in predictions]
 
         # Quantum advantage from multiple quantum circuits
         quantum_advantage = np.mean([p.quantum_advantage_factor for p in predictions])
@@ -341,16 +1325,81 @@ class QuantumEnsemblePredictor:
             warnings=[]
         )
 
+    @staticmethod
+    def _predict_member(predictor: QuantumTimeSeriesPredictor, data: np.ndarray) -> Optional[PredictionResult]:
+        try:
+            return predictor.predict(data)
+        except Exception as e:
+            print(f"Ensemble member failed: {e}")
+            return None
+
+    def _predict_serial(self, data: np.ndarray) -> List[Optional[PredictionResult]]:
+        return [self._predict_member(predictor, data) for predictor in self.predictors]
+
+    def _predict_pool(self, data: np.ndarray) -> List[Optional[PredictionResult]]:
+        if self.executor is None:
+            if not pool_importable():
+                warn_pool_fallback()
+                self.strategy = "serial"
+                return self._predict_serial(data)
+            self.executor = ProcessPoolExecutor(
+                max_workers=len(self.predictors),
+                initializer=_init_pool_members,
+                initargs=(self.predictors,)
+            )
+            self._owns_executor = True
+
+        if self._owns_executor:
+            futures = [self.executor.submit(_pool_member_predict, index, data) for index in range(len(self.predictors))]
+        else:
+            futures = [self.executor.submit(predictor.predict, data) for predictor in self.predictors]
+
+        members = []
+        for future in futures:
+            try:
+                members.append(future.result())
+            except POOL_ERRORS as e:
+                abandon_pool(futures, e)
+                if self._owns_executor:
+                    self.close()
+                    self.strategy = "serial"
+                return self._predict_serial(data)
+            except Exception as e:
+                print(f"Ensemble member failed: {e}")
+                members.append(None)
+        return members
+
+    def _predict_vectorized(self, data: np.ndarray) -> List[Optional[PredictionResult]]:
+        lead = self.predictors[0]
+        if any(
+            p.sequence_length != lead.sequence_length or p.forecast_horizon != lead.forecast_horizon
+            for p in self.predictors
+        ):
+            raise ValueError("Vectorized ensembles need members with the same sequence_length and forecast_horizon")
+        if len(data) < lead.sequence_length:
+            print(f"Ensemble member failed: Need at least {lead.sequence_length} historical points")
+            return [None] * len(self.predictors)
+
+        # Every member starts from the same normalized window; rollouts diverge per member
+        normalized = lead.normalize_timeseries(data[-lead.sequence_length:])
+        window = RollingFeatureWindow(np.tile(normalized, (len(self.predictors), 1)))
+        solvers = [p.hybrid_solver for p in self.predictors]
+        predictions, confidence = lead._rollout(
+            window, lambda features: HybridQuantumClassicalSolver.predict_stacked(solvers, features)
+        )
+        batch = lead._batch_result(predictions, confidence, np.min(data), np.max(data))
+        return [batch.row(index) for index in range(len(batch))]
+
 
 def example_usage():
     """Example of using the quantum prediction framework"""
 
     # Generate synthetic historical data
-    np.random.seed(42)
-    historical_data = np.cumsum(np.random.randn(200) * 0.02 + 0.001) + 100
+    rng = np.random.default_rng(42)
+    historical_data = np.cumsum(rng.standard_normal(200) * 0.02 + 0.001) + 100
 
     # Create ensemble predictor
-    ensemble = QuantumEnsemblePredictor(num_ensemble_members=3)
+    ensemble = QuantumEnsemblePredictor(num_ensemble_members=3, seed=42)
 
     # Make prediction
     result = ensemble.predict(historical_data)